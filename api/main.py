@@ -241,8 +241,7 @@ async def inject_scenario(scenario: ScenarioInput):
 async def clear_scenarios():
     """Clear all active failure scenarios."""
     simulator = get_simulator()
-    count = len(simulator.failure_scenarios)
-    simulator.failure_scenarios.clear()
+    count = simulator.clear_scenarios()
     return {"message": f"Cleared {count} active scenarios"}
 
 
@@ -159,7 +159,7 @@ def render_sidebar():
     
     # Clear All
     if st.sidebar.button("🧹 Clear All Scenarios", key="clear_all"):
-        simulator.failure_scenarios.clear()
+        simulator.clear_scenarios()
         st.sidebar.success("All scenarios cleared!")
     
     # Active scenarios display
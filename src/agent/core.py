@@ -136,7 +136,7 @@ class PaymentAgent:
     def _observe_phase(self, results: Dict):
         """Observation phase"""
         # Update agent state with current metrics
-        self.state.update_metrics(list(self.observer.transactions_window))
+        self.state.update_metrics(self.observer.recent_columns, self.observer.window_cutoff_ns)
         
         # Get summary
         summary = self.observer.get_summary()
@@ -250,6 +250,8 @@ class PaymentAgent:
         )
         
         results['rollbacks_executed'] = rolled_back
+        for action_id in rolled_back:
+            self.memory.resolve_action(action_id)
         
         if rolled_back:
             self.logger.warning(f"Rolled back {len(rolled_back)} actions")
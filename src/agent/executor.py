@@ -76,8 +76,9 @@ class PaymentExecutor:
             self._log_execution(action, baseline_metrics, success, message)
             
             # Update state
-            state.actions_taken_last_hour += 1
+            state.record_action()
             state.actions_executed += 1
+            state.mark_executing(action)
             
             self.logger.info(
                 f"Action {action.action_id} ({action.action_type.value}) "
@@ -156,7 +157,7 @@ class PaymentExecutor:
             return False, "No issuer specified"
         
         # Activate circuit breaker
-        state.active_circuit_breakers.add(issuer)
+        state.add_circuit_breaker(issuer)
         
         self.logger.info(
             f"Circuit breaker activated for issuer {issuer} "
@@ -222,7 +223,7 @@ class PaymentExecutor:
         if not method:
             return False, "No payment method specified"
         
-        state.suppressed_methods.add(method)
+        state.suppress_method(method)
         
         self.logger.warning(f"Payment method {method} suppressed")
         
@@ -314,7 +315,7 @@ class PaymentExecutor:
                 success = self._rollback_action(action, state)
                 if success:
                     rolled_back.append(action_id)
-                    state.rollbacks_last_hour += 1
+                    state.record_rollback()
                     self.logger.warning(
                         f"Action {action_id} rolled back: {reason}"
                     )
@@ -361,7 +362,7 @@ class PaymentExecutor:
         try:
             if action.action_type == ActionType.CIRCUIT_BREAKER:
                 issuer = action.parameters.get('issuer')
-                state.active_circuit_breakers.discard(issuer)
+                state.remove_circuit_breaker(issuer)
             
             elif action.action_type == ActionType.ADJUST_RETRY:
                 target = action.target
@@ -375,7 +376,7 @@ class PaymentExecutor:
             
             elif action.action_type == ActionType.METHOD_SUPPRESS:
                 method = action.parameters.get('payment_method')
-                state.suppressed_methods.discard(method)
+                state.unsuppress_method(method)
             
             # Remove from active interventions
             if action.action_id in self.active_interventions:
@@ -383,6 +384,7 @@ class PaymentExecutor:
             
             action.status = "rolled_back"
             action.completed_at = datetime.now()
+            state.mark_complete(action)
             
             return True
         
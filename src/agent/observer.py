@@ -4,18 +4,128 @@ Ingests and preprocesses payment transaction data in real-time.
 """
 
 import json
-from collections import defaultdict, deque
+import time
+from collections import Counter, deque
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Deque, Dict, List, Optional, Tuple
 
 import numpy as np
 
 from src.models.state import (
+    METHOD_CODES,
+    STATUS_CODES,
+    STATUS_SUCCESS,
     AgentMemory,
     PaymentMethod,
     PaymentStatus,
     PaymentTransaction,
+    TransactionColumns,
 )
+from src.utils.jit import njit
+
+
+# Log-linear latency buckets: 64 per power of two, covering 0ms to ~65s
+LATENCY_BUCKETS = 1024
+LATENCY_BUCKETS_PER_OCTAVE = 64
+
+# Statistic dimensions (first axis of the observer counts matrix)
+DIM_OVERALL, DIM_ISSUER, DIM_METHOD, DIM_REGION, DIM_MERCHANT = range(5)
+DIMENSIONS = ('overall', 'by_issuer', 'by_method', 'by_region', 'by_merchant')
+N_DIMS = len(DIMENSIONS)
+_DIM_INDEX = {name: dim for dim, name in enumerate(DIMENSIONS)}
+
+# Initial key capacity per dimension (grows by doubling)
+INITIAL_KEYS_PER_DIM = 64
+
+# Initial sliding window capacity (grows by doubling; never drops in-window rows)
+INITIAL_WINDOW_CAPACITY = 1024
+
+# Most recent latency samples kept for exact overall percentiles
+OVERALL_LATENCY_SAMPLES = 1000
+
+# Representative latency (geometric bucket midpoint) for each bucket index
+_BUCKET_VALUES = np.exp2((np.arange(LATENCY_BUCKETS) + 0.5) / LATENCY_BUCKETS_PER_OCTAVE) - 1.0
+_SUMMARY_QUANTILES = np.array([0.50, 0.95, 0.99])
+
+_EMPTY_LATENCY = {'p50': 0, 'p95': 0, 'p99': 0, 'mean': 0, 'max': 0}
+
+_DIM_RANGE = np.arange(N_DIMS)
+
+# Ingested rows are staged in Python and written to the arrays in bulk
+# once this many are pending, or before any read
+STAGE_ROWS = 512
+
+# Window rows compared per step when looking for expired rows
+_EVICT_SCAN = 256
+
+# Per-transaction columns of the sliding window ring buffer
+_WINDOW_COLUMNS = ('_win_ts_ns', '_win_keys', '_win_status', '_win_latency', '_win_bucket', '_win_retry')
+
+
+def _latency_buckets(latencies: np.ndarray) -> np.ndarray:
+    """Map latencies to histogram bucket indices (-1 for latencies <= 0, which are not tracked)"""
+    buckets = np.full(len(latencies), -1, dtype=np.int16)
+    tracked = latencies > 0
+    buckets[tracked] = np.minimum(
+        LATENCY_BUCKETS - 1,
+        np.log2(latencies[tracked] + 1) * LATENCY_BUCKETS_PER_OCTAVE
+    )
+    return buckets
+
+
+def _latency_summary(counts: np.ndarray, sums: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Compute p50, p95, p99, mean and max for every row of a histogram matrix.
+    
+    Args:
+        counts: (rows, LATENCY_BUCKETS) bucket counts
+        sums: (rows,) sum of recorded latencies per row
+    
+    Returns:
+        Dictionary of (rows,) arrays; empty rows report zeros
+    """
+    cumulative = np.cumsum(counts, axis=1)
+    totals = cumulative[:, -1]
+    empty = totals <= 0
+    
+    # First bucket whose cumulative count reaches each quantile's rank
+    ranks = np.maximum(np.ceil(totals[:, None] * _SUMMARY_QUANTILES), 1)
+    quantiles = _BUCKET_VALUES[(cumulative[:, None, :] >= ranks[:, :, None]).argmax(-1)]
+    quantiles[empty] = 0.0
+    
+    last_bucket = counts.shape[1] - 1 - (counts[:, ::-1] > 0).argmax(1)
+    maxes = np.where(empty, 0.0, _BUCKET_VALUES[last_bucket])
+    means = np.divide(sums, totals, out=np.zeros(len(totals)), where=~empty)
+    
+    return {
+        'p50': quantiles[:, 0],
+        'p95': quantiles[:, 1],
+        'p99': quantiles[:, 2],
+        'mean': means,
+        'max': maxes
+    }
+
+
+@njit(cache=True)
+def _scan_low_success(success, totals, min_volume, threshold):
+    """
+    Find keys whose success rate is below threshold with enough volume.
+    
+    Returns:
+        Tuple of (key ids, success rates) for the flagged keys
+    """
+    flagged = np.empty(totals.size, dtype=np.int64)
+    rates = np.empty(totals.size, dtype=np.float64)
+    n = 0
+    for i in range(totals.size):
+        total = totals[i]
+        if total >= min_volume:
+            rate = success[i] / total
+            if rate < threshold:
+                flagged[n] = i
+                rates[n] = rate
+                n += 1
+    return flagged[:n], rates[:n]
 
 
 class PaymentObserver:
@@ -29,35 +139,74 @@ class PaymentObserver:
     - Detect basic anomalies in transaction flow
     """
     
+    __slots__ = (
+        'window_size', '_window_ns', 'memory',
+        '_transactions_window', '_retry_count_window', '_staged', '_cutoff_ns',
+        '_win_head', '_win_len',
+        '_win_ts_ns', '_win_keys', '_win_status', '_win_latency', '_win_bucket', '_win_retry',
+        'counts', '_key_ids',
+        '_overall_lat', '_overall_lat_idx', '_overall_lat_len',
+        'latency_hists', 'latency_sums',
+        'error_codes', 'error_messages',
+        '_retry_attempted', '_retry_succeeded',
+        '_version', '_cached_issuer_health', '_cached_method_performance',
+    )
+    
     def __init__(self, window_size_minutes: int = 10):
         self.window_size = timedelta(minutes=window_size_minutes)
+        self._window_ns = window_size_minutes * 60 * 1_000_000_000
         self.memory = AgentMemory()
         
-        # Sliding windows for different dimensions
-        self.transactions_window = deque()
-        
-        # Real-time statistics
-        self.stats = {
-            'overall': defaultdict(lambda: {'success': 0, 'failed': 0, 'total': 0}),
-            'by_issuer': defaultdict(lambda: {'success': 0, 'failed': 0, 'total': 0}),
-            'by_method': defaultdict(lambda: {'success': 0, 'failed': 0, 'total': 0}),
-            'by_region': defaultdict(lambda: {'success': 0, 'failed': 0, 'total': 0}),
-            'by_merchant': defaultdict(lambda: {'success': 0, 'failed': 0, 'total': 0}),
+        # Sliding window. Transactions are kept for callers; what eviction
+        # needs (epoch ns timestamp, key rows, status, latency, retry flag)
+        # lives in ring-buffer columns so old rows can be removed in bulk.
+        # New rows wait in _staged until the next flush (see _sync).
+        self._transactions_window = deque()
+        self._retry_count_window = 0
+        self._staged: List[tuple] = []
+        self._cutoff_ns = 0  # Window cutoff (epoch ns) as of the latest ingest
+        self._win_head = 0
+        self._win_len = 0
+        self._win_ts_ns = np.empty(INITIAL_WINDOW_CAPACITY, dtype=np.int64)
+        self._win_keys = np.empty((INITIAL_WINDOW_CAPACITY, N_DIMS), dtype=np.int32)
+        self._win_status = np.empty(INITIAL_WINDOW_CAPACITY, dtype=np.int8)
+        self._win_latency = np.empty(INITIAL_WINDOW_CAPACITY)
+        self._win_bucket = np.empty(INITIAL_WINDOW_CAPACITY, dtype=np.int16)  # -1: latency not tracked
+        self._win_retry = np.empty(INITIAL_WINDOW_CAPACITY, dtype=bool)
+        
+        # Real-time statistics: counts[dim, key_id] = [success, failed]
+        self.counts = np.zeros((N_DIMS, INITIAL_KEYS_PER_DIM, 2), dtype=np.int64)
+        self._key_ids: List[Dict[str, int]] = [{} for _ in range(N_DIMS)]
+        self._key_ids[DIM_OVERALL]['current'] = 0
+        
+        # Latency tracking. Overall latency keeps the most recent samples in
+        # a preallocated ring buffer; per-key latencies are histograms over
+        # the sliding window, one matrix per dimension sharing the key ids
+        # of the counts matrix.
+        self._overall_lat = np.empty(OVERALL_LATENCY_SAMPLES, dtype=np.float32)
+        self._overall_lat_idx = 0
+        self._overall_lat_len = 0
+        self.latency_hists = {
+            DIM_ISSUER: np.zeros((INITIAL_KEYS_PER_DIM, LATENCY_BUCKETS), dtype=np.int32),
+            DIM_METHOD: np.zeros((INITIAL_KEYS_PER_DIM, LATENCY_BUCKETS), dtype=np.int32),
         }
-        
-        # Latency tracking
-        self.latencies = {
-            'overall': deque(maxlen=1000),
-            'by_issuer': defaultdict(lambda: deque(maxlen=100)),
-            'by_method': defaultdict(lambda: deque(maxlen=100)),
+        self.latency_sums = {
+            DIM_ISSUER: np.zeros(INITIAL_KEYS_PER_DIM),
+            DIM_METHOD: np.zeros(INITIAL_KEYS_PER_DIM),
         }
         
         # Error tracking
-        self.error_codes = defaultdict(int)
-        self.error_messages = defaultdict(int)
+        self.error_codes = Counter()
+        self.error_messages = Counter()
         
-        # Retry tracking
-        self.retry_stats = defaultdict(lambda: {'attempted': 0, 'succeeded': 0})
+        # Retry tracking, keyed by original transaction id
+        self._retry_attempted: Dict[str, int] = {}
+        self._retry_succeeded: Dict[str, int] = {}
+        
+        # Derived metrics are cached until the next ingest bumps the version
+        self._version = 0
+        self._cached_issuer_health = (-1, None)
+        self._cached_method_performance = (-1, None)
         
     def ingest_transaction(self, transaction: PaymentTransaction):
         """
@@ -66,101 +215,267 @@ class PaymentObserver:
         Args:
             transaction: PaymentTransaction object
         """
-        # Add to memory
-        self.memory.add_transaction(transaction)
+        self._cutoff_ns = time.time_ns() - self._window_ns
+        self._stage(transaction)
+        if len(self._staged) >= STAGE_ROWS:
+            self._sync()
+    
+    def ingest_batch(self, transactions: List[PaymentTransaction]):
+        """
+        Ingest multiple transactions.
         
-        # Add to sliding window
-        self.transactions_window.append(transaction)
-        self._cleanup_old_transactions()
+        Same as ingesting them one by one, but the clock is read once for
+        the whole batch.
+        """
+        if not transactions:
+            return
         
-        # Update statistics
-        self._update_stats(transaction)
+        self._cutoff_ns = time.time_ns() - self._window_ns
+        stage = self._stage
+        for transaction in transactions:
+            stage(transaction)
+        if len(self._staged) >= STAGE_ROWS:
+            self._sync()
+    
+    def _stage(self, transaction: PaymentTransaction):
+        """
+        Record a transaction.
         
-        # Track latency
-        self._track_latency(transaction)
+        The transaction window deque, errors and retries are updated right
+        away; the row for memory and the array-backed statistics is staged
+        as a tuple and written by the next _flush.
+        """
+        self._version += 1
+        txn = transaction
+        is_success = txn.status is PaymentStatus.SUCCESS
+        
+        # Key ids (inlined lookups; _key_id assigns ids to new keys)
+        issuer_ids, method_ids, region_ids, merchant_ids = self._key_ids[DIM_ISSUER:]
+        issuer_id = issuer_ids.get(txn.issuer)
+        if issuer_id is None:
+            issuer_id = self._key_id(DIM_ISSUER, txn.issuer)
+        method_id = method_ids.get(txn.payment_method.value)
+        if method_id is None:
+            method_id = self._key_id(DIM_METHOD, txn.payment_method.value)
+        region_id = region_ids.get(txn.region)
+        if region_id is None:
+            region_id = self._key_id(DIM_REGION, txn.region)
+        merchant_id = merchant_ids.get(txn.merchant_id)
+        if merchant_id is None:
+            merchant_id = self._key_id(DIM_MERCHANT, txn.merchant_id)
+        
+        # Add to sliding window (and memory, on flush)
+        self._transactions_window.append(txn)
+        self._staged.append((
+            txn.timestamp.timestamp(), issuer_id, method_id, region_id, merchant_id,
+            txn.status, txn.payment_method, txn.latency_ms, txn.amount, txn.is_retry
+        ))
         
         # Track errors
-        if transaction.status == PaymentStatus.FAILED:
-            if transaction.error_code:
-                self.error_codes[transaction.error_code] += 1
-            if transaction.error_message:
-                self.error_messages[transaction.error_message] += 1
+        if txn.status is PaymentStatus.FAILED:
+            if error_code := txn.error_code:
+                self.error_codes[error_code] += 1
+            if error_message := txn.error_message:
+                self.error_messages[error_message] += 1
         
         # Track retries
-        if transaction.is_retry:
-            original_id = transaction.original_transaction_id or transaction.transaction_id
-            self.retry_stats[original_id]['attempted'] += 1
-            if transaction.status == PaymentStatus.SUCCESS:
-                self.retry_stats[original_id]['succeeded'] += 1
+        if txn.is_retry:
+            self._retry_count_window += 1
+            original_id = txn.original_transaction_id or txn.transaction_id
+            self._retry_attempted[original_id] = self._retry_attempted.get(original_id, 0) + 1
+            if is_success:
+                self._retry_succeeded[original_id] = self._retry_succeeded.get(original_id, 0) + 1
     
-    def ingest_batch(self, transactions: List[PaymentTransaction]):
-        """Ingest multiple transactions"""
-        for transaction in transactions:
-            self.ingest_transaction(transaction)
-    
-    def _cleanup_old_transactions(self):
-        """Remove transactions outside the sliding window"""
-        cutoff_time = datetime.now() - self.window_size
-        while self.transactions_window and self.transactions_window[0].timestamp < cutoff_time:
-            old_txn = self.transactions_window.popleft()
-            self._remove_from_stats(old_txn)
-    
-    def _update_stats(self, transaction: PaymentTransaction):
-        """Update real-time statistics"""
-        status_key = 'success' if transaction.status == PaymentStatus.SUCCESS else 'failed'
-        
-        # Overall stats
-        self.stats['overall']['current'][status_key] += 1
-        self.stats['overall']['current']['total'] += 1
-        
-        # By issuer
-        self.stats['by_issuer'][transaction.issuer][status_key] += 1
-        self.stats['by_issuer'][transaction.issuer]['total'] += 1
-        
-        # By payment method
-        method = transaction.payment_method.value
-        self.stats['by_method'][method][status_key] += 1
-        self.stats['by_method'][method]['total'] += 1
-        
-        # By region
-        self.stats['by_region'][transaction.region][status_key] += 1
-        self.stats['by_region'][transaction.region]['total'] += 1
-        
-        # By merchant
-        self.stats['by_merchant'][transaction.merchant_id][status_key] += 1
-        self.stats['by_merchant'][transaction.merchant_id]['total'] += 1
-    
-    def _remove_from_stats(self, transaction: PaymentTransaction):
-        """Remove transaction from statistics when it leaves the window"""
-        status_key = 'success' if transaction.status == PaymentStatus.SUCCESS else 'failed'
-        
-        # Overall stats
-        self.stats['overall']['current'][status_key] -= 1
-        self.stats['overall']['current']['total'] -= 1
-        
-        # By issuer
-        self.stats['by_issuer'][transaction.issuer][status_key] -= 1
-        self.stats['by_issuer'][transaction.issuer]['total'] -= 1
-        
-        # By payment method
-        method = transaction.payment_method.value
-        self.stats['by_method'][method][status_key] -= 1
-        self.stats['by_method'][method]['total'] -= 1
-        
-        # By region
-        self.stats['by_region'][transaction.region][status_key] -= 1
-        self.stats['by_region'][transaction.region]['total'] -= 1
-        
-        # By merchant
-        self.stats['by_merchant'][transaction.merchant_id][status_key] -= 1
-        self.stats['by_merchant'][transaction.merchant_id]['total'] -= 1
-    
-    def _track_latency(self, transaction: PaymentTransaction):
-        """Track latency metrics"""
-        if transaction.latency_ms > 0:
-            self.latencies['overall'].append(transaction.latency_ms)
-            self.latencies['by_issuer'][transaction.issuer].append(transaction.latency_ms)
-            self.latencies['by_method'][transaction.payment_method.value].append(transaction.latency_ms)
+    def _sync(self):
+        """Bring the statistics up to date: flush staged rows, then evict expired ones"""
+        self._flush()
+        self._cleanup_old_transactions(self._cutoff_ns)
+    
+    def _flush(self):
+        """Write staged rows to memory, the window columns, counts and latency tracking"""
+        staged = self._staged
+        if not staged:
+            return
+        self._staged = []
+        
+        (timestamps, issuers, methods, regions, merchants,
+         statuses, payment_methods, latencies, amounts, retries) = zip(*staged)
+        keys = np.zeros((len(staged), N_DIMS), dtype=np.int32)
+        keys[:, DIM_ISSUER] = issuers
+        keys[:, DIM_METHOD] = methods
+        keys[:, DIM_REGION] = regions
+        keys[:, DIM_MERCHANT] = merchants
+        status_codes = np.array([STATUS_CODES[status] for status in statuses], dtype=np.int8)
+        status = (status_codes != STATUS_SUCCESS).astype(np.int8)  # 0 = success, 1 = failed
+        latencies = np.array(latencies, dtype=np.float64)
+        buckets = _latency_buckets(latencies)
+        ts_ns = (np.array(timestamps) * 1e9).astype(np.int64)
+        
+        self.memory.add_transactions(
+            status=status_codes,
+            method=np.array([METHOD_CODES[method] for method in payment_methods], dtype=np.int8),
+            latency_ms=latencies,
+            amount=np.array(amounts, dtype=np.float64),
+            timestamp_ns=ts_ns,
+            issuer_id=keys[:, DIM_ISSUER]
+        )
+        self._window_extend(ts_ns, keys, status, latencies, buckets, np.array(retries, dtype=bool))
+        np.add.at(self.counts, (_DIM_RANGE, keys, status[:, None]), 1)
+        self._track_latencies(latencies, buckets, keys)
+    
+    def _window_extend(
+        self,
+        ts_ns: np.ndarray,
+        keys: np.ndarray,
+        status: np.ndarray,
+        latencies: np.ndarray,
+        buckets: np.ndarray,
+        retries: np.ndarray
+    ):
+        """Append rows to the window ring-buffer columns"""
+        n = len(ts_ns)
+        capacity = len(self._win_ts_ns)
+        while self._win_len + n > capacity:
+            self._grow_window()
+            capacity *= 2
+        
+        slots = (self._win_head + self._win_len + np.arange(n)) % capacity
+        self._win_ts_ns[slots] = ts_ns
+        self._win_keys[slots] = keys
+        self._win_status[slots] = status
+        self._win_latency[slots] = latencies
+        self._win_bucket[slots] = buckets
+        self._win_retry[slots] = retries
+        self._win_len += n
+    
+    def _grow_window(self):
+        """Double the window ring buffer, unwrapping it to start at slot 0"""
+        capacity = len(self._win_ts_ns)
+        order = (self._win_head + np.arange(self._win_len)) % capacity
+        for name in _WINDOW_COLUMNS:
+            column = getattr(self, name)
+            grown = np.empty((capacity * 2,) + column.shape[1:], dtype=column.dtype)
+            grown[:self._win_len] = column[order]
+            setattr(self, name, grown)
+        self._win_head = 0
+    
+    def _count_expired(self, cutoff_ns: int) -> int:
+        """Number of rows at the head of the window older than the cutoff"""
+        timestamps = self._win_ts_ns
+        capacity = len(timestamps)
+        if not self._win_len or timestamps[self._win_head] >= cutoff_ns:
+            return 0
+        
+        expired = 0
+        while expired < self._win_len:
+            start = (self._win_head + expired) % capacity
+            stop = min(capacity, start + self._win_len - expired, start + _EVICT_SCAN)
+            old = timestamps[start:stop] < cutoff_ns
+            if not old.all():
+                return expired + int(old.argmin())
+            expired += stop - start
+        return expired
+    
+    def _cleanup_old_transactions(self, cutoff_ns: int):
+        """Remove transactions outside the sliding window (staged rows must be flushed)"""
+        expired = self._count_expired(cutoff_ns)
+        if not expired:
+            return
+        
+        head = self._win_head
+        capacity = len(self._win_ts_ns)
+        for _ in range(expired):
+            self._transactions_window.popleft()
+        slots = (head + np.arange(expired)) % capacity
+        self._win_head = (head + expired) % capacity
+        self._win_len -= expired
+        
+        # Remove the expired rows from the statistics in bulk
+        keys = self._win_keys[slots]
+        np.subtract.at(self.counts, (_DIM_RANGE, keys, self._win_status[slots, None]), 1)
+        
+        buckets = self._win_bucket[slots]
+        tracked = buckets >= 0
+        if tracked.any():
+            buckets = buckets[tracked]
+            latencies = self._win_latency[slots][tracked]
+            for dim, hists in self.latency_hists.items():
+                rows = keys[tracked, dim]
+                np.subtract.at(hists, (rows, buckets), 1)
+                np.subtract.at(self.latency_sums[dim], rows, latencies)
+        
+        self._retry_count_window -= int(np.count_nonzero(self._win_retry[slots]))
+    
+    def _key_id(self, dim: int, key: str) -> int:
+        """Get the counts row for a dimension key, assigning one if new"""
+        ids = self._key_ids[dim]
+        key_id = ids.get(key)
+        if key_id is None:
+            key_id = len(ids)
+            ids[key] = key_id
+            capacity = self.counts.shape[1]
+            if key_id >= capacity:
+                grown = np.zeros((N_DIMS, capacity * 2, 2), dtype=np.int64)
+                grown[:, :capacity] = self.counts
+                self.counts = grown
+            
+            hists = self.latency_hists.get(dim)
+            if hists is not None and key_id >= hists.shape[0]:
+                rows = hists.shape[0]
+                self.latency_hists[dim] = np.concatenate([hists, np.zeros_like(hists)])
+                self.latency_sums[dim] = np.concatenate([self.latency_sums[dim], np.zeros(rows)])
+        return key_id
+    
+    def _track_latencies(self, latencies: np.ndarray, buckets: np.ndarray, keys: np.ndarray):
+        """Track latency metrics for flushed rows (bucket is -1 for untracked latencies)"""
+        tracked = buckets >= 0
+        if not tracked.all():
+            latencies, buckets, keys = latencies[tracked], buckets[tracked], keys[tracked]
+        n = len(latencies)
+        if not n:
+            return
+        
+        if n >= OVERALL_LATENCY_SAMPLES:
+            self._overall_lat[:] = latencies[-OVERALL_LATENCY_SAMPLES:]
+            self._overall_lat_idx = 0
+        else:
+            idx = self._overall_lat_idx
+            self._overall_lat[(idx + np.arange(n)) % OVERALL_LATENCY_SAMPLES] = latencies
+            self._overall_lat_idx = (idx + n) % OVERALL_LATENCY_SAMPLES
+        self._overall_lat_len = min(OVERALL_LATENCY_SAMPLES, self._overall_lat_len + n)
+        
+        for dim, hists in self.latency_hists.items():
+            rows = keys[:, dim]
+            np.add.at(hists, (rows, buckets), 1)
+            np.add.at(self.latency_sums[dim], rows, latencies)
+    
+    @property
+    def transactions_window(self) -> Deque[PaymentTransaction]:
+        """Transactions in the sliding window, oldest first"""
+        self._sync()
+        return self._transactions_window
+    
+    @property
+    def retry_count_window(self) -> int:
+        """Retries in the sliding window"""
+        self._sync()
+        return self._retry_count_window
+    
+    @property
+    def recent_columns(self) -> TransactionColumns:
+        """Memory's transaction columns, including every transaction ingested so far"""
+        self._flush()
+        return self.memory.recent_transactions
+    
+    @property
+    def window_cutoff_ns(self) -> int:
+        """Start of the sliding window (epoch ns) as of the latest ingest"""
+        return self._cutoff_ns
+    
+    @property
+    def version(self) -> int:
+        """Ingest counter; changes whenever the observed data changes"""
+        return self._version
     
     def get_success_rate(self, dimension: str = 'overall', key: str = 'current') -> float:
         """
@@ -173,11 +488,16 @@ class PaymentObserver:
         Returns:
             Success rate as a float between 0 and 1
         """
-        stats = self.stats[dimension][key]
-        total = stats['total']
+        self._sync()
+        dim = _DIM_INDEX[dimension]
+        key_id = self._key_ids[dim].get(key)
+        if key_id is None:
+            return 1.0
+        success, failed = self.counts[dim, key_id]
+        total = success + failed
         if total == 0:
             return 1.0
-        return stats['success'] / total
+        return float(success / total)
     
     def get_failure_rate(self, dimension: str = 'overall', key: str = 'current') -> float:
         """Calculate failure rate"""
@@ -188,46 +508,127 @@ class PaymentObserver:
         Get latency statistics.
         
         Returns:
-            Dictionary with p50, p95, p99, mean, max
+            Dictionary with p50, p95, p99, mean, max. Overall stats are exact
+            over the most recent samples; per-key percentiles are approximate.
         """
+        self._sync()
         if dimension == 'overall':
-            latencies = list(self.latencies['overall'])
-        else:
-            latencies = list(self.latencies[dimension][key])
+            if self._overall_lat_len == 0:
+                return dict(_EMPTY_LATENCY)
+            
+            latencies = self._overall_lat[:self._overall_lat_len]
+            # Linear-interpolated quantiles from an O(n) partial sort
+            positions = (len(latencies) - 1) * _SUMMARY_QUANTILES
+            lower = np.floor(positions).astype(np.intp)
+            upper = np.ceil(positions).astype(np.intp)
+            partitioned = np.partition(latencies, np.union1d(lower, upper))
+            low_values = partitioned[lower].astype(np.float64)
+            p50, p95, p99 = low_values + (partitioned[upper] - low_values) * (positions - lower)
+            return {
+                'p50': float(p50),
+                'p95': float(p95),
+                'p99': float(p99),
+                'mean': float(latencies.mean()),
+                'max': float(latencies.max())
+            }
         
-        if not latencies:
-            return {'p50': 0, 'p95': 0, 'p99': 0, 'mean': 0, 'max': 0}
+        dim = _DIM_INDEX[dimension]
+        key_id = self._key_ids[dim].get(key)
+        if key_id is None or dim not in self.latency_hists:
+            return dict(_EMPTY_LATENCY)
         
-        latencies_array = np.array(latencies)
-        return {
-            'p50': float(np.percentile(latencies_array, 50)),
-            'p95': float(np.percentile(latencies_array, 95)),
-            'p99': float(np.percentile(latencies_array, 99)),
-            'mean': float(np.mean(latencies_array)),
-            'max': float(np.max(latencies_array))
-        }
+        summary = _latency_summary(
+            self.latency_hists[dim][key_id:key_id + 1],
+            self.latency_sums[dim][key_id:key_id + 1]
+        )
+        return {name: float(values[0]) for name, values in summary.items()}
     
     def get_transaction_volume(self, dimension: str = 'overall', key: str = 'current') -> int:
         """Get transaction volume"""
-        return self.stats[dimension][key]['total']
+        self._sync()
+        dim = _DIM_INDEX[dimension]
+        key_id = self._key_ids[dim].get(key)
+        if key_id is None:
+            return 0
+        return int(self.counts[dim, key_id].sum())
     
-    def get_retry_efficiency(self) -> float:
-        """Calculate overall retry efficiency"""
-        if not self.retry_stats:
-            return 1.0
+    def _dimension_counts(self, dim: int):
+        """Get keys, success counts and totals for every key in a dimension"""
+        self._sync()
+        keys = list(self._key_ids[dim])
+        counts = self.counts[dim, :len(keys)]
+        return keys, counts[:, 0], counts.sum(-1)
+    
+    def get_dimension_stats(self, dimension: str) -> Dict[str, Dict[str, int]]:
+        """Get success/failed/total counts for every key in a dimension"""
+        keys, success, totals = self._dimension_counts(_DIM_INDEX[dimension])
+        return {
+            key: {'success': int(ok), 'failed': int(total - ok), 'total': int(total)}
+            for key, ok, total in zip(keys, success.tolist(), totals.tolist())
+        }
+    
+    def get_dimension_arrays(self, dimension: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Get metrics for every active key in a dimension as parallel arrays.
         
-        total_retries = sum(s['attempted'] for s in self.retry_stats.values())
-        successful_retries = sum(s['succeeded'] for s in self.retry_stats.values())
+        Returns:
+            Tuple of (keys, volumes, success_rates, avg_latencies); dimensions
+            without latency tracking report zero latency
+        """
+        dim = _DIM_INDEX[dimension]
+        keys, success, totals = self._dimension_counts(dim)
+        active = np.flatnonzero(totals > 0)
+        volumes = totals[active]
+        rates = success[active] / volumes
+        
+        if dim in self.latency_hists:
+            latency_counts = self.latency_hists[dim][active].sum(1)
+            latencies = np.divide(
+                self.latency_sums[dim][active], latency_counts,
+                out=np.zeros(len(active)), where=latency_counts > 0
+            )
+        else:
+            latencies = np.zeros(len(active))
         
+        return np.array(keys, dtype=object)[active], volumes, rates, latencies
+    
+    @property
+    def stats(self) -> Dict[str, Dict[str, Dict[str, int]]]:
+        """Counts for all dimensions, keyed by dimension name then key"""
+        return {dimension: self.get_dimension_stats(dimension) for dimension in DIMENSIONS}
+    
+    def get_retry_efficiency(self) -> float:
+        """Calculate overall retry efficiency"""
+        total_retries = sum(self._retry_attempted.values())
         if total_retries == 0:
             return 1.0
         
-        return successful_retries / total_retries
+        return sum(self._retry_succeeded.values()) / total_retries
     
     def get_top_errors(self, n: int = 5) -> List[tuple]:
         """Get top N error codes by frequency"""
-        sorted_errors = sorted(self.error_codes.items(), key=lambda x: x[1], reverse=True)
-        return sorted_errors[:n]
+        return self.error_codes.most_common(n)
+    
+    def _dimension_health(self, dim: int) -> Dict[str, Dict[str, float]]:
+        """Success rates and latency for every active key in a dimension"""
+        keys, success, totals = self._dimension_counts(dim)
+        active = np.flatnonzero(totals > 0)
+        rates = success[active] / totals[active]
+        latency = _latency_summary(self.latency_hists[dim][active], self.latency_sums[dim][active])
+        
+        return {
+            keys[i]: {
+                'success_rate': rate,
+                'failure_rate': 1.0 - rate,
+                'volume': total,
+                'avg_latency': mean,
+                'p95_latency': p95
+            }
+            for i, rate, total, mean, p95 in zip(
+                active.tolist(), rates.tolist(), totals[active].tolist(),
+                latency['mean'].tolist(), latency['p95'].tolist()
+            )
+        }
     
     def get_issuer_health(self) -> Dict[str, Dict[str, float]]:
         """
@@ -236,57 +637,42 @@ class PaymentObserver:
         Returns:
             Dictionary mapping issuer to health metrics
         """
-        health = {}
-        for issuer, stats in self.stats['by_issuer'].items():
-            total = stats['total']
-            if total == 0:
-                continue
-            
-            success_rate = stats['success'] / total
-            latency = self.get_latency_stats('by_issuer', issuer)
-            
-            health[issuer] = {
-                'success_rate': success_rate,
-                'failure_rate': 1.0 - success_rate,
-                'volume': total,
-                'avg_latency': latency['mean'],
-                'p95_latency': latency['p95']
-            }
-        
+        version, health = self._cached_issuer_health
+        if version != self._version:
+            health = self._dimension_health(DIM_ISSUER)
+            self._cached_issuer_health = (self._version, health)
         return health
     
     def get_method_performance(self) -> Dict[str, Dict[str, float]]:
         """Get performance metrics for all payment methods"""
-        performance = {}
-        for method, stats in self.stats['by_method'].items():
-            total = stats['total']
-            if total == 0:
-                continue
-            
-            success_rate = stats['success'] / total
-            latency = self.get_latency_stats('by_method', method)
-            
-            performance[method] = {
-                'success_rate': success_rate,
-                'failure_rate': 1.0 - success_rate,
-                'volume': total,
-                'avg_latency': latency['mean'],
-                'p95_latency': latency['p95']
-            }
-        
+        version, performance = self._cached_method_performance
+        if version != self._version:
+            performance = self._dimension_health(DIM_METHOD)
+            self._cached_method_performance = (self._version, performance)
         return performance
     
-    def detect_basic_anomalies(self) -> List[Dict]:
+    def detect_basic_anomalies(
+        self,
+        overall_success: Optional[float] = None,
+        latency_stats: Optional[Dict[str, float]] = None,
+        retry_efficiency: Optional[float] = None
+    ) -> List[Dict]:
         """
         Detect basic anomalies in the transaction stream.
         
+        Args:
+            overall_success: Precomputed overall success rate (computed if None)
+            latency_stats: Precomputed overall latency stats (computed if None)
+            retry_efficiency: Precomputed retry efficiency (computed if None)
+        
         Returns:
             List of anomaly dictionaries
         """
         anomalies = []
         
         # Check for sudden drops in success rate
-        overall_success = self.get_success_rate('overall', 'current')
+        if overall_success is None:
+            overall_success = self.get_success_rate('overall', 'current')
         if overall_success < 0.85:  # Below 85% success rate
             anomalies.append({
                 'type': 'low_success_rate',
@@ -294,18 +680,21 @@ class PaymentObserver:
                 'message': f'Overall success rate dropped to {overall_success:.2%}'
             })
         
-        # Check individual issuers
-        for issuer, health in self.get_issuer_health().items():
-            if health['success_rate'] < 0.80 and health['volume'] >= 10:
-                anomalies.append({
-                    'type': 'issuer_degradation',
-                    'severity': 1.0 - health['success_rate'],
-                    'affected': issuer,
-                    'message': f'Issuer {issuer} has {health["success_rate"]:.2%} success rate'
-                })
+        # Check individual issuers (below 80% success with 10+ transactions)
+        issuers, success, totals = self._dimension_counts(DIM_ISSUER)
+        flagged, rates = _scan_low_success(success, totals, 10, 0.80)
+        for i, success_rate in zip(flagged.tolist(), rates.tolist()):
+            issuer = issuers[i]
+            anomalies.append({
+                'type': 'issuer_degradation',
+                'severity': 1.0 - success_rate,
+                'affected': issuer,
+                'message': f'Issuer {issuer} has {success_rate:.2%} success rate'
+            })
         
         # Check for high latency
-        latency_stats = self.get_latency_stats('overall')
+        if latency_stats is None:
+            latency_stats = self.get_latency_stats('overall')
         if latency_stats['p95'] > 1000:  # Over 1 second at p95
             anomalies.append({
                 'type': 'high_latency',
@@ -314,8 +703,9 @@ class PaymentObserver:
             })
         
         # Check retry efficiency
-        retry_efficiency = self.get_retry_efficiency()
-        if retry_efficiency < 0.30 and len(self.retry_stats) >= 10:
+        if retry_efficiency is None:
+            retry_efficiency = self.get_retry_efficiency()
+        if retry_efficiency < 0.30 and len(self._retry_attempted) >= 10:
             anomalies.append({
                 'type': 'low_retry_efficiency',
                 'severity': 1.0 - retry_efficiency,
@@ -325,16 +715,28 @@ class PaymentObserver:
         return anomalies
     
     def get_summary(self) -> Dict:
-        """Get a summary of current observations"""
+        """
+        Get a summary of current observations.
+        
+        The summary is stamped with 'timestamp_ns' (epoch nanoseconds) and,
+        from the same clock reading, the ISO 8601 local-time 'timestamp' it
+        has always carried.
+        """
+        overall_success = self.get_success_rate('overall', 'current')
+        overall_latency = self.get_latency_stats('overall')
+        retry_efficiency = self.get_retry_efficiency()
+        timestamp_ns = time.time_ns()
+        
         return {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': datetime.fromtimestamp(timestamp_ns / 1e9).isoformat(),
+            'timestamp_ns': timestamp_ns,
             'window_size_minutes': self.window_size.seconds / 60,
             'total_transactions': len(self.transactions_window),
-            'overall_success_rate': self.get_success_rate('overall', 'current'),
-            'overall_latency': self.get_latency_stats('overall'),
-            'retry_efficiency': self.get_retry_efficiency(),
+            'overall_success_rate': overall_success,
+            'overall_latency': overall_latency,
+            'retry_efficiency': retry_efficiency,
             'top_errors': self.get_top_errors(3),
-            'issuer_count': len(self.stats['by_issuer']),
-            'method_count': len(self.stats['by_method']),
-            'anomalies': self.detect_basic_anomalies()
+            'issuer_count': len(self._key_ids[DIM_ISSUER]),
+            'method_count': len(self._key_ids[DIM_METHOD]),
+            'anomalies': self.detect_basic_anomalies(overall_success, overall_latency, retry_efficiency)
         }
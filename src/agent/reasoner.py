@@ -3,15 +3,109 @@ Reasoner Component
 Detects patterns, forms hypotheses, and analyzes payment behavior.
 """
 
+import heapq
+import itertools
 import math
-from collections import defaultdict
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 
 import numpy as np
-from scipy import stats
 
-from src.models.state import Hypothesis, Pattern, PaymentTransaction
+from src.models.state import Hypothesis, Pattern, PatternType, PaymentTransaction
+from src.utils.jit import njit
+
+
+# Evidence lines for each pattern type, formatted from the pattern's metrics
+# and affected_value when Pattern.evidence is first read
+_ISSUER_EVIDENCE = (
+    'Success rate: {current_success_rate:.2%} (baseline: {baseline_success_rate:.2%})',
+    'Volume: {volume} transactions',
+    'Average latency: {avg_latency:.0f}ms'
+)
+_RETRY_EVIDENCE = (
+    'Retry percentage: {retry_percentage:.1%}',
+    'Retry efficiency: {retry_efficiency:.1%}',
+    '{total_retries} retries out of {total_transactions} transactions'
+)
+_METHOD_EVIDENCE = (
+    'Success rate: {current_success_rate:.2%} (baseline: {baseline_success_rate:.2%})',
+    'Volume: {volume} transactions',
+    'Degradation: {degradation:.1%}'
+)
+_LATENCY_EVIDENCE = (
+    'P95 latency: {p95:.0f}ms (baseline: {baseline:.0f}ms)',
+    'Spike factor: {spike_factor:.1f}x',
+    'P99 latency: {p99:.0f}ms'
+)
+_ERROR_EVIDENCE = (
+    'Error code: {affected_value}',
+    'Occurrences: {error_count}',
+    'Error rate: {error_rate:.1%}'
+)
+_GEOGRAPHIC_EVIDENCE = (
+    'Region success rate: {region_success_rate:.2%}',
+    'Overall success rate: {overall_success_rate:.2%}',
+    'Volume: {volume} transactions'
+)
+
+
+@njit(cache=True, fastmath=True)
+def _calculate_confidence(sample_size, effect_size):
+    """
+    Calculate confidence score based on sample size and effect size.
+    
+    Uses statistical principles: larger samples and stronger effects = higher confidence.
+    Sample size enters through a sigmoid, effect size linearly with saturation,
+    and the two are combined with a geometric mean.
+    """
+    size_confidence = 1.0 / (1.0 + math.exp(-0.05 * (sample_size - 50)))
+    effect_confidence = min(effect_size / 0.3, 1.0)
+    return min(max(math.sqrt(size_confidence * effect_confidence), 0.0), 1.0)
+
+
+@njit(cache=True, nogil=True)
+def _score_degradation(volumes, degradation, min_volume, threshold, severity_scale):
+    """
+    Flag rows with enough volume whose degradation reaches a threshold.
+    
+    Args:
+        volumes: (n,) transaction volume per row
+        degradation: (n,) drop in success rate from baseline per row
+        min_volume: Minimum volume for a row to be considered
+        threshold: Minimum degradation to flag a row
+        severity_scale: Degradation that maps to severity 1.0
+    
+    Returns:
+        Tuple of (flagged row ids, severities, confidences) for flagged rows
+    """
+    n = degradation.shape[0]
+    flagged = np.empty(n, dtype=np.int64)
+    count = 0
+    for i in range(n):
+        if volumes[i] >= min_volume and degradation[i] >= threshold:
+            flagged[count] = i
+            count += 1
+    flagged = flagged[:count]
+    
+    severities = np.empty(count)
+    confidences = np.empty(count)
+    for j in range(count):
+        i = flagged[j]
+        severities[j] = min(degradation[i] / severity_scale, 1.0)
+        confidences[j] = _calculate_confidence(volumes[i], degradation[i])
+    return flagged, severities, confidences
+
+
+def _calculate_confidence_arr(sample_sizes: np.ndarray, effect_sizes: np.ndarray) -> np.ndarray:
+    """Confidence scores for arrays of sample sizes and effect sizes"""
+    confidence = np.multiply(sample_sizes, -0.05, dtype=float)
+    confidence += 2.5  # -0.05 * (sample_size - 50)
+    np.exp(confidence, out=confidence)
+    confidence += 1.0
+    np.reciprocal(confidence, out=confidence)
+    confidence *= np.minimum(effect_sizes / 0.3, 1.0)
+    np.sqrt(confidence, out=confidence)
+    return np.clip(confidence, 0.0, 1.0, out=confidence)
 
 
 class PaymentReasoner:
@@ -31,12 +125,18 @@ class PaymentReasoner:
         # Baseline metrics (learned over time)
         self.baselines = {
             'overall_success_rate': 0.95,
-            'issuer_success_rates': defaultdict(lambda: 0.95),
-            'method_success_rates': defaultdict(lambda: 0.95),
             'avg_latency': 200.0,
             'retry_efficiency': 0.60
         }
         
+        # Per-key success rate baselines; keys are interned to array rows and
+        # the extra last row holds the 0.95 default for keys not yet seen
+        self._baseline_ids: Dict[str, Dict[str, int]] = {'issuer': {}, 'method': {}}
+        self._baseline_rates: Dict[str, np.ndarray] = {
+            'issuer': np.full(1, 0.95),
+            'method': np.full(1, 0.95)
+        }
+        
         # Pattern detection thresholds
         self.thresholds = {
             'issuer_degradation': 0.15,  # 15% drop from baseline
@@ -48,123 +148,210 @@ class PaymentReasoner:
         
         # Known pattern library
         self.pattern_library = self._initialize_pattern_library()
+        
+        # Static hypotheses (root cause, probability, evidence formats) per pattern type
+        self._hypothesis_templates = self._initialize_hypothesis_templates()
+        
+        # Observer reads shared by one analysis and baseline update: (observer, version, aggregates)
+        self._cached_aggregates = (None, -1, None)
+        
+        # Hypothesis generator for each pattern type
+        self._hypothesis_generators = {
+            PatternType.ISSUER_DEGRADATION: self._generate_issuer_hypotheses,
+            PatternType.RETRY_STORM: self._generate_retry_hypotheses,
+            PatternType.METHOD_FATIGUE: self._generate_method_hypotheses,
+            PatternType.LATENCY_SPIKE: self._generate_latency_hypotheses,
+            PatternType.ERROR_CLUSTER: self._generate_error_hypotheses,
+            PatternType.GEOGRAPHIC_ISSUE: self._generate_geographic_hypotheses
+        }
     
-    def _initialize_pattern_library(self) -> Dict[str, Dict]:
+    def _initialize_pattern_library(self) -> Dict[PatternType, Dict]:
         """Initialize library of known payment patterns"""
         return {
-            'issuer_degradation': {
+            PatternType.ISSUER_DEGRADATION: {
                 'description': 'Issuer experiencing elevated failure rates',
                 'typical_causes': ['issuer_down', 'issuer_throttling', 'network_issue'],
                 'indicators': ['sudden_failure_spike', 'specific_error_codes', 'geographic_clustering']
             },
-            'retry_storm': {
+            PatternType.RETRY_STORM: {
                 'description': 'Excessive retries causing cascading failures',
                 'typical_causes': ['aggressive_retry_config', 'payment_gateway_issue', 'timeout_misconfiguration'],
                 'indicators': ['high_retry_percentage', 'increasing_latency', 'low_retry_success']
             },
-            'method_fatigue': {
+            PatternType.METHOD_FATIGUE: {
                 'description': 'Payment method showing degraded performance after retries',
                 'typical_causes': ['card_issuer_limits', 'fraud_detection_triggers', 'user_cancellation'],
                 'indicators': ['declining_retry_success', 'specific_method_affected', 'error_pattern']
             },
-            'geographic_issue': {
+            PatternType.GEOGRAPHIC_ISSUE: {
                 'description': 'Failures concentrated in specific region',
                 'typical_causes': ['network_outage', 'regional_bank_issue', 'compliance_block'],
                 'indicators': ['geographic_clustering', 'multiple_issuers_affected', 'timing_correlation']
             },
-            'temporal_pattern': {
+            PatternType.TEMPORAL_PATTERN: {
                 'description': 'Time-based failure pattern',
                 'typical_causes': ['peak_load_issue', 'scheduled_maintenance', 'business_hours_effect'],
                 'indicators': ['time_correlation', 'recurring_pattern', 'volume_correlation']
             }
         }
     
-    def analyze(self, observer) -> List[Pattern]:
+    def _initialize_hypothesis_templates(self) -> Dict[PatternType, List[Tuple[str, float, Tuple[str, ...]]]]:
+        """
+        Initialize hypotheses whose probabilities do not depend on metrics.
+        
+        Evidence strings are formatted with the pattern's metrics and
+        affected_value.
+        """
+        return {
+            PatternType.METHOD_FATIGUE: [
+                ('fraud_detection_triggers', 0.4, ('Repeated attempts may trigger fraud systems',)),
+                ('user_cancellation', 0.3, ('Users may be canceling after failed retries',)),
+                ('method_limits', 0.3, ('Payment method may have transaction limits',))
+            ],
+            PatternType.LATENCY_SPIKE: [
+                ('system_load', 0.4, ('Latency spike factor: {spike_factor:.1f}x',)),
+                ('network_congestion', 0.3, ('Latency affecting all transactions',)),
+                ('downstream_slowness', 0.3, ('Banks/processors may be slow',))
+            ],
+            PatternType.ERROR_CLUSTER: [
+                ('specific_error_condition', 0.6, ('Error {affected_value} highly concentrated',)),
+                ('configuration_issue', 0.4, ('Systematic error pattern suggests config problem',))
+            ],
+            PatternType.GEOGRAPHIC_ISSUE: [
+                ('regional_network_outage', 0.5, ('Region {affected_value} significantly degraded',)),
+                ('regional_bank_issue', 0.3, ('May affect specific banks in region',)),
+                ('compliance_block', 0.2, ('Could be regulatory/compliance issue',))
+            ]
+        }
+    
+    def _baseline_rows(self, dimension: str, keys: np.ndarray) -> np.ndarray:
+        """Map keys to rows of a baseline array, adding new keys at 0.95"""
+        ids = self._baseline_ids[dimension]
+        rows = np.fromiter((ids.setdefault(key, len(ids)) for key in keys), dtype=np.intp, count=len(keys))
+        
+        missing = len(ids) + 1 - len(self._baseline_rates[dimension])
+        if missing:
+            self._baseline_rates[dimension] = np.concatenate(
+                [self._baseline_rates[dimension], np.full(missing, 0.95)]
+            )
+        return rows
+    
+    def _gather_baselines(self, dimension: str, keys: np.ndarray) -> np.ndarray:
+        """Look up baselines for keys without interning them; unseen keys get the default"""
+        ids = self._baseline_ids[dimension]
+        rows = np.fromiter((ids.get(key, -1) for key in keys), dtype=np.intp, count=len(keys))
+        return np.take(self._baseline_rates[dimension], rows)
+    
+    def _aggregate(self, observer) -> Dict:
+        """
+        Read everything the detectors and baseline updates need from the observer.
+        
+        The result is reused until the observer ingests more transactions, so
+        an analysis and the baseline update that follows it share one read.
+        """
+        cached_observer, version, aggregates = self._cached_aggregates
+        if cached_observer is observer and version == observer.version:
+            return aggregates
+        
+        aggregates = {
+            'total_txns': observer.get_transaction_volume('overall', 'current'),
+            'overall_rate': observer.get_success_rate('overall', 'current'),
+            'by_issuer': observer.get_dimension_arrays('by_issuer'),
+            'by_method': observer.get_dimension_arrays('by_method'),
+            'by_region': observer.get_dimension_arrays('by_region'),
+            'retry_count': observer.retry_count_window,
+            'retry_efficiency': observer.get_retry_efficiency(),
+            'top_errors': observer.get_top_errors(n=5),
+            'latency': observer.get_latency_stats('overall')
+        }
+        self._cached_aggregates = (observer, observer.version, aggregates)
+        return aggregates
+    
+    def analyze(self, observer, top_k: Optional[int] = None) -> List[Pattern]:
         """
         Main analysis method - detect all patterns in current data.
         
         Args:
             observer: PaymentObserver instance with current data
+            top_k: Only return the top_k most severe patterns (all if None)
         
         Returns:
-            List of detected patterns
+            List of detected patterns, most severe first
         """
-        patterns = []
+        now = datetime.now()
+        aggregates = self._aggregate(observer)
         
         # Detect different pattern types
-        patterns.extend(self._detect_issuer_degradation(observer))
-        patterns.extend(self._detect_retry_storms(observer))
-        patterns.extend(self._detect_method_fatigue(observer))
-        patterns.extend(self._detect_latency_spikes(observer))
-        patterns.extend(self._detect_error_clusters(observer))
-        patterns.extend(self._detect_geographic_issues(observer))
+        patterns = itertools.chain(
+            self._detect_issuer_degradation(aggregates, now),
+            self._detect_retry_storms(aggregates, now),
+            self._detect_method_fatigue(aggregates, now),
+            self._detect_latency_spikes(aggregates, now),
+            self._detect_error_clusters(aggregates, now),
+            self._detect_geographic_issues(aggregates, now)
+        )
         
         # Sort by severity
-        patterns.sort(key=lambda p: p.severity, reverse=True)
-        
-        return patterns
+        if top_k is None:
+            return sorted(patterns, key=lambda p: p.severity, reverse=True)
+        return heapq.nlargest(top_k, patterns, key=lambda p: p.severity)
     
-    def _detect_issuer_degradation(self, observer) -> List[Pattern]:
+    def _detect_issuer_degradation(self, aggregates: Dict, now: datetime) -> Iterator[Pattern]:
         """Detect issuers with degraded performance"""
-        patterns = []
-        issuer_health = observer.get_issuer_health()
+        issuers, volumes, rates, latencies = aggregates['by_issuer']
         
-        for issuer, health in issuer_health.items():
-            baseline = self.baselines['issuer_success_rates'][issuer]
-            degradation = baseline - health['success_rate']
-            
-            # Only flag if volume is significant and degradation exceeds threshold
-            if health['volume'] >= 10 and degradation >= self.thresholds['issuer_degradation']:
-                severity = min(degradation / 0.3, 1.0)  # Normalize to 0-1
-                confidence = self._calculate_confidence(health['volume'], degradation)
-                
-                pattern = Pattern(
-                    pattern_id='',
-                    pattern_type='issuer_degradation',
-                    description=f'Issuer {issuer} showing {degradation:.1%} drop in success rate',
-                    severity=severity,
-                    confidence=confidence,
-                    affected_dimension='issuer',
-                    affected_value=issuer,
-                    metrics={
-                        'current_success_rate': health['success_rate'],
-                        'baseline_success_rate': baseline,
-                        'degradation': degradation,
-                        'volume': health['volume'],
-                        'avg_latency': health['avg_latency']
-                    },
-                    detected_at=datetime.now(),
-                    evidence=[
-                        f'Success rate: {health["success_rate"]:.2%} (baseline: {baseline:.2%})',
-                        f'Volume: {health["volume"]} transactions',
-                        f'Average latency: {health["avg_latency"]:.0f}ms'
-                    ]
-                )
-                patterns.append(pattern)
-        
-        return patterns
+        baselines = self._gather_baselines('issuer', issuers)
+        degradation = baselines - rates
+        
+        # Only flag if volume is significant and degradation exceeds threshold
+        flagged, severities, confidences = _score_degradation(
+            volumes, degradation, 10, self.thresholds['issuer_degradation'], 0.3
+        )
+        
+        for issuer, volume, success_rate, avg_latency, baseline, drop, severity, confidence in zip(
+            issuers[flagged].tolist(), volumes[flagged].tolist(), rates[flagged].tolist(),
+            latencies[flagged].tolist(), baselines[flagged].tolist(),
+            degradation[flagged].tolist(), severities.tolist(), confidences.tolist()
+        ):
+            pattern = Pattern(
+                pattern_id='',
+                pattern_type=PatternType.ISSUER_DEGRADATION,
+                description=f'Issuer {issuer} showing {drop:.1%} drop in success rate',
+                severity=severity,
+                confidence=confidence,
+                affected_dimension='issuer',
+                affected_value=issuer,
+                metrics={
+                    'current_success_rate': success_rate,
+                    'baseline_success_rate': baseline,
+                    'degradation': drop,
+                    'volume': volume,
+                    'avg_latency': avg_latency
+                },
+                detected_at=now,
+                evidence_templates=_ISSUER_EVIDENCE
+            )
+            yield pattern
     
-    def _detect_retry_storms(self, observer) -> List[Pattern]:
+    def _detect_retry_storms(self, aggregates: Dict, now: datetime) -> Iterator[Pattern]:
         """Detect excessive retry behavior"""
-        patterns = []
-        
         # Calculate retry percentage
-        total_txns = observer.get_transaction_volume('overall', 'current')
-        retry_count = sum(1 for txn in observer.transactions_window if txn.is_retry)
+        total_txns = aggregates['total_txns']
+        retry_count = aggregates['retry_count']
         
         if total_txns == 0:
-            return patterns
+            return
         
         retry_percentage = retry_count / total_txns
-        retry_efficiency = observer.get_retry_efficiency()
+        retry_efficiency = aggregates['retry_efficiency']
         
         if retry_percentage >= self.thresholds['retry_storm']:
             severity = min(retry_percentage / 0.6, 1.0)
-            confidence = self._calculate_confidence(total_txns, retry_percentage - 0.2)
+            confidence = _calculate_confidence(total_txns, retry_percentage - 0.2)
             
             pattern = Pattern(
                 pattern_id='',
-                pattern_type='retry_storm',
+                pattern_type=PatternType.RETRY_STORM,
                 description=f'{retry_percentage:.1%} of traffic is retries with {retry_efficiency:.1%} success rate',
                 severity=severity,
                 confidence=confidence,
@@ -176,60 +363,50 @@ class PaymentReasoner:
                     'total_retries': retry_count,
                     'total_transactions': total_txns
                 },
-                detected_at=datetime.now(),
-                evidence=[
-                    f'Retry percentage: {retry_percentage:.1%}',
-                    f'Retry efficiency: {retry_efficiency:.1%}',
-                    f'{retry_count} retries out of {total_txns} transactions'
-                ]
+                detected_at=now,
+                evidence_templates=_RETRY_EVIDENCE
             )
-            patterns.append(pattern)
-        
-        return patterns
+            yield pattern
     
-    def _detect_method_fatigue(self, observer) -> List[Pattern]:
+    def _detect_method_fatigue(self, aggregates: Dict, now: datetime) -> Iterator[Pattern]:
         """Detect payment methods with declining performance after retries"""
-        patterns = []
-        method_performance = observer.get_method_performance()
+        methods, volumes, rates, _ = aggregates['by_method']
         
-        for method, perf in method_performance.items():
-            baseline = self.baselines['method_success_rates'][method]
-            degradation = baseline - perf['success_rate']
-            
-            # Check if degradation is significant and volume is meaningful
-            if perf['volume'] >= 20 and degradation >= self.thresholds['method_fatigue']:
-                severity = min(degradation / 0.4, 1.0)
-                confidence = self._calculate_confidence(perf['volume'], degradation)
-                
-                pattern = Pattern(
-                    pattern_id='',
-                    pattern_type='method_fatigue',
-                    description=f'Payment method {method} showing {degradation:.1%} drop in success rate',
-                    severity=severity,
-                    confidence=confidence,
-                    affected_dimension='payment_method',
-                    affected_value=method,
-                    metrics={
-                        'current_success_rate': perf['success_rate'],
-                        'baseline_success_rate': baseline,
-                        'degradation': degradation,
-                        'volume': perf['volume']
-                    },
-                    detected_at=datetime.now(),
-                    evidence=[
-                        f'Success rate: {perf["success_rate"]:.2%} (baseline: {baseline:.2%})',
-                        f'Volume: {perf["volume"]} transactions',
-                        f'Degradation: {degradation:.1%}'
-                    ]
-                )
-                patterns.append(pattern)
-        
-        return patterns
+        baselines = self._gather_baselines('method', methods)
+        degradation = baselines - rates
+        
+        # Check if degradation is significant and volume is meaningful
+        flagged, severities, confidences = _score_degradation(
+            volumes, degradation, 20, self.thresholds['method_fatigue'], 0.4
+        )
+        
+        for method, volume, success_rate, baseline, drop, severity, confidence in zip(
+            methods[flagged].tolist(), volumes[flagged].tolist(), rates[flagged].tolist(),
+            baselines[flagged].tolist(), degradation[flagged].tolist(),
+            severities.tolist(), confidences.tolist()
+        ):
+            pattern = Pattern(
+                pattern_id='',
+                pattern_type=PatternType.METHOD_FATIGUE,
+                description=f'Payment method {method} showing {drop:.1%} drop in success rate',
+                severity=severity,
+                confidence=confidence,
+                affected_dimension='payment_method',
+                affected_value=method,
+                metrics={
+                    'current_success_rate': success_rate,
+                    'baseline_success_rate': baseline,
+                    'degradation': drop,
+                    'volume': volume
+                },
+                detected_at=now,
+                evidence_templates=_METHOD_EVIDENCE
+            )
+            yield pattern
     
-    def _detect_latency_spikes(self, observer) -> List[Pattern]:
+    def _detect_latency_spikes(self, aggregates: Dict, now: datetime) -> Iterator[Pattern]:
         """Detect unusual latency increases"""
-        patterns = []
-        latency_stats = observer.get_latency_stats('overall')
+        latency_stats = aggregates['latency']
         baseline = self.baselines['avg_latency']
         
         current_p95 = latency_stats['p95']
@@ -241,7 +418,7 @@ class PaymentReasoner:
             
             pattern = Pattern(
                 pattern_id='',
-                pattern_type='latency_spike',
+                pattern_type=PatternType.LATENCY_SPIKE,
                 description=f'P95 latency at {current_p95:.0f}ms ({spike_factor:.1f}x baseline)',
                 severity=severity,
                 confidence=confidence,
@@ -255,116 +432,81 @@ class PaymentReasoner:
                     'baseline': baseline,
                     'spike_factor': spike_factor
                 },
-                detected_at=datetime.now(),
-                evidence=[
-                    f'P95 latency: {current_p95:.0f}ms (baseline: {baseline:.0f}ms)',
-                    f'Spike factor: {spike_factor:.1f}x',
-                    f'P99 latency: {latency_stats["p99"]:.0f}ms'
-                ]
+                detected_at=now,
+                evidence_templates=_LATENCY_EVIDENCE
             )
-            patterns.append(pattern)
-        
-        return patterns
+            yield pattern
     
-    def _detect_error_clusters(self, observer) -> List[Pattern]:
+    def _detect_error_clusters(self, aggregates: Dict, now: datetime) -> Iterator[Pattern]:
         """Detect clusters of similar errors"""
-        patterns = []
-        top_errors = observer.get_top_errors(n=5)
-        
-        for error_code, count in top_errors:
-            if count >= self.thresholds['error_cluster']:
-                total = observer.get_transaction_volume('overall', 'current')
-                error_rate = count / max(total, 1)
-                
-                severity = min(error_rate / 0.1, 1.0)  # 10% error rate = max severity
-                confidence = self._calculate_confidence(count, error_rate)
-                
-                pattern = Pattern(
-                    pattern_id='',
-                    pattern_type='error_cluster',
-                    description=f'Error {error_code} occurring {count} times ({error_rate:.1%} of traffic)',
-                    severity=severity,
-                    confidence=confidence,
-                    affected_dimension='error_code',
-                    affected_value=error_code,
-                    metrics={
-                        'error_count': count,
-                        'total_transactions': total,
-                        'error_rate': error_rate
-                    },
-                    detected_at=datetime.now(),
-                    evidence=[
-                        f'Error code: {error_code}',
-                        f'Occurrences: {count}',
-                        f'Error rate: {error_rate:.1%}'
-                    ]
-                )
-                patterns.append(pattern)
-        
-        return patterns
+        total = aggregates['total_txns']
+        top_errors = aggregates['top_errors']
+        if not top_errors:
+            return
+        
+        codes, counts = zip(*top_errors)
+        counts = np.asarray(counts, dtype=np.int64)
+        flagged = np.flatnonzero(counts >= self.thresholds['error_cluster'])
+        error_rates = counts[flagged] / max(total, 1)
+        severities = np.minimum(error_rates / 0.1, 1.0)  # 10% error rate = max severity
+        confidences = _calculate_confidence_arr(counts[flagged], error_rates)
+        
+        for i, count, error_rate, severity, confidence in zip(
+            flagged.tolist(), counts[flagged].tolist(), error_rates.tolist(),
+            severities.tolist(), confidences.tolist()
+        ):
+            error_code = codes[i]
+            
+            pattern = Pattern(
+                pattern_id='',
+                pattern_type=PatternType.ERROR_CLUSTER,
+                description=f'Error {error_code} occurring {count} times ({error_rate:.1%} of traffic)',
+                severity=severity,
+                confidence=confidence,
+                affected_dimension='error_code',
+                affected_value=error_code,
+                metrics={
+                    'error_count': count,
+                    'total_transactions': total,
+                    'error_rate': error_rate
+                },
+                detected_at=now,
+                evidence_templates=_ERROR_EVIDENCE
+            )
+            yield pattern
     
-    def _detect_geographic_issues(self, observer) -> List[Pattern]:
+    def _detect_geographic_issues(self, aggregates: Dict, now: datetime) -> Iterator[Pattern]:
         """Detect region-specific failures"""
-        patterns = []
-        
         # Get regional statistics
-        regional_stats = observer.stats['by_region']
-        
-        for region, stats in regional_stats.items():
-            if stats['total'] < 10:  # Skip low-volume regions
-                continue
-            
-            success_rate = stats['success'] / stats['total'] if stats['total'] > 0 else 1.0
-            
-            # Compare to overall success rate
-            overall_rate = observer.get_success_rate('overall', 'current')
-            degradation = overall_rate - success_rate
-            
-            if degradation >= 0.20:  # 20% worse than overall
-                severity = min(degradation / 0.4, 1.0)
-                confidence = self._calculate_confidence(stats['total'], degradation)
-                
-                pattern = Pattern(
-                    pattern_id='',
-                    pattern_type='geographic_issue',
-                    description=f'Region {region} has {success_rate:.1%} success rate vs {overall_rate:.1%} overall',
-                    severity=severity,
-                    confidence=confidence,
-                    affected_dimension='region',
-                    affected_value=region,
-                    metrics={
-                        'region_success_rate': success_rate,
-                        'overall_success_rate': overall_rate,
-                        'degradation': degradation,
-                        'volume': stats['total']
-                    },
-                    detected_at=datetime.now(),
-                    evidence=[
-                        f'Region success rate: {success_rate:.2%}',
-                        f'Overall success rate: {overall_rate:.2%}',
-                        f'Volume: {stats["total"]} transactions'
-                    ]
-                )
-                patterns.append(pattern)
-        
-        return patterns
-    
-    def _calculate_confidence(self, sample_size: int, effect_size: float) -> float:
-        """
-        Calculate confidence score based on sample size and effect size.
-        
-        Uses statistical principles: larger samples and stronger effects = higher confidence.
-        """
-        # Sample size factor (sigmoid function)
-        size_confidence = 1 / (1 + math.exp(-0.05 * (sample_size - 50)))
+        overall_rate = aggregates['overall_rate']
+        regions, volumes, rates, _ = aggregates['by_region']
         
-        # Effect size factor (linear with saturation)
-        effect_confidence = min(effect_size / 0.3, 1.0)
+        # Compare to overall success rate (flag 20% worse), skipping low-volume regions
+        degradation = overall_rate - rates
+        flagged, severities, confidences = _score_degradation(volumes, degradation, 10, 0.20, 0.4)
         
-        # Combined confidence (geometric mean)
-        confidence = math.sqrt(size_confidence * effect_confidence)
-        
-        return min(max(confidence, 0.0), 1.0)
+        for region, volume, success_rate, drop, severity, confidence in zip(
+            regions[flagged].tolist(), volumes[flagged].tolist(), rates[flagged].tolist(),
+            degradation[flagged].tolist(), severities.tolist(), confidences.tolist()
+        ):
+            pattern = Pattern(
+                pattern_id='',
+                pattern_type=PatternType.GEOGRAPHIC_ISSUE,
+                description=f'Region {region} has {success_rate:.1%} success rate vs {overall_rate:.1%} overall',
+                severity=severity,
+                confidence=confidence,
+                affected_dimension='region',
+                affected_value=region,
+                metrics={
+                    'region_success_rate': success_rate,
+                    'overall_success_rate': overall_rate,
+                    'degradation': drop,
+                    'volume': volume
+                },
+                detected_at=now,
+                evidence_templates=_GEOGRAPHIC_EVIDENCE
+            )
+            yield pattern
     
     def generate_hypotheses(self, pattern: Pattern) -> List[Hypothesis]:
         """
@@ -379,29 +521,23 @@ class PaymentReasoner:
         hypotheses = []
         pattern_info = self.pattern_library.get(pattern.pattern_type, {})
         typical_causes = pattern_info.get('typical_causes', [])
+        now = datetime.now()
         
-        if pattern.pattern_type == 'issuer_degradation':
-            hypotheses = self._generate_issuer_hypotheses(pattern, typical_causes)
-        elif pattern.pattern_type == 'retry_storm':
-            hypotheses = self._generate_retry_hypotheses(pattern, typical_causes)
-        elif pattern.pattern_type == 'method_fatigue':
-            hypotheses = self._generate_method_hypotheses(pattern, typical_causes)
-        elif pattern.pattern_type == 'latency_spike':
-            hypotheses = self._generate_latency_hypotheses(pattern, typical_causes)
-        elif pattern.pattern_type == 'error_cluster':
-            hypotheses = self._generate_error_hypotheses(pattern, typical_causes)
-        elif pattern.pattern_type == 'geographic_issue':
-            hypotheses = self._generate_geographic_hypotheses(pattern, typical_causes)
+        generate = self._hypothesis_generators.get(pattern.pattern_type)
+        if generate is not None:
+            hypotheses = generate(pattern, typical_causes, now)
         
         # Normalize probabilities
-        total_prob = sum(h.probability for h in hypotheses)
-        if total_prob > 0:
-            for h in hypotheses:
-                h.probability /= total_prob
+        if hypotheses:
+            probabilities = np.fromiter((h.probability for h in hypotheses), dtype=float, count=len(hypotheses))
+            total_prob = probabilities.sum()
+            if total_prob > 0:
+                for h, probability in zip(hypotheses, (probabilities / total_prob).tolist()):
+                    h.probability = probability
         
         return hypotheses
     
-    def _generate_issuer_hypotheses(self, pattern: Pattern, typical_causes: List[str]) -> List[Hypothesis]:
+    def _generate_issuer_hypotheses(self, pattern: Pattern, typical_causes: List[str], now: datetime) -> List[Hypothesis]:
         """Generate hypotheses for issuer degradation"""
         hypotheses = []
         metrics = pattern.metrics
@@ -420,7 +556,7 @@ class PaymentReasoner:
             contradicting_evidence=[
                 'Some transactions still succeeding' if metrics['current_success_rate'] > 0.10 else ''
             ],
-            created_at=datetime.now()
+            created_at=now
         ))
         
         # Hypothesis 2: Issuer throttling
@@ -435,7 +571,7 @@ class PaymentReasoner:
                 f'Partial success rate: {metrics["current_success_rate"]:.1%}'
             ],
             contradicting_evidence=[],
-            created_at=datetime.now()
+            created_at=now
         ))
         
         # Hypothesis 3: Network issue
@@ -448,12 +584,12 @@ class PaymentReasoner:
                 'Degradation pattern consistent with connectivity issues'
             ],
             contradicting_evidence=[],
-            created_at=datetime.now()
+            created_at=now
         ))
         
         return hypotheses
     
-    def _generate_retry_hypotheses(self, pattern: Pattern, typical_causes: List[str]) -> List[Hypothesis]:
+    def _generate_retry_hypotheses(self, pattern: Pattern, typical_causes: List[str], now: datetime) -> List[Hypothesis]:
         """Generate hypotheses for retry storms"""
         hypotheses = []
         metrics = pattern.metrics
@@ -468,7 +604,7 @@ class PaymentReasoner:
                 f'Low retry efficiency: {metrics["retry_efficiency"]:.1%}'
             ],
             contradicting_evidence=[],
-            created_at=datetime.now()
+            created_at=now
         ))
         
         hypotheses.append(Hypothesis(
@@ -481,7 +617,7 @@ class PaymentReasoner:
                 f'Total retries: {metrics["total_retries"]}'
             ],
             contradicting_evidence=[],
-            created_at=datetime.now()
+            created_at=now
         ))
         
         hypotheses.append(Hypothesis(
@@ -493,149 +629,63 @@ class PaymentReasoner:
                 'Multiple retries failing suggests upstream problem'
             ],
             contradicting_evidence=[],
-            created_at=datetime.now()
+            created_at=now
         ))
         
         return hypotheses
     
-    def _generate_method_hypotheses(self, pattern: Pattern, typical_causes: List[str]) -> List[Hypothesis]:
-        """Generate hypotheses for payment method fatigue"""
+    def _instantiate_hypotheses(self, pattern: Pattern, now: datetime) -> List[Hypothesis]:
+        """Build hypotheses for a pattern from its static templates"""
+        fields = {'affected_value': pattern.affected_value, **pattern.metrics}
         return [
             Hypothesis(
                 hypothesis_id='',
                 pattern_id=pattern.pattern_id,
-                root_cause='fraud_detection_triggers',
-                probability=0.4,
-                supporting_evidence=['Repeated attempts may trigger fraud systems'],
+                root_cause=root_cause,
+                probability=probability,
+                supporting_evidence=[evidence.format(**fields) for evidence in supporting_evidence],
                 contradicting_evidence=[],
-                created_at=datetime.now()
-            ),
-            Hypothesis(
-                hypothesis_id='',
-                pattern_id=pattern.pattern_id,
-                root_cause='user_cancellation',
-                probability=0.3,
-                supporting_evidence=['Users may be canceling after failed retries'],
-                contradicting_evidence=[],
-                created_at=datetime.now()
-            ),
-            Hypothesis(
-                hypothesis_id='',
-                pattern_id=pattern.pattern_id,
-                root_cause='method_limits',
-                probability=0.3,
-                supporting_evidence=['Payment method may have transaction limits'],
-                contradicting_evidence=[],
-                created_at=datetime.now()
+                created_at=now
             )
+            for root_cause, probability, supporting_evidence in self._hypothesis_templates[pattern.pattern_type]
         ]
     
-    def _generate_latency_hypotheses(self, pattern: Pattern, typical_causes: List[str]) -> List[Hypothesis]:
+    def _generate_method_hypotheses(self, pattern: Pattern, typical_causes: List[str], now: datetime) -> List[Hypothesis]:
+        """Generate hypotheses for payment method fatigue"""
+        return self._instantiate_hypotheses(pattern, now)
+    
+    def _generate_latency_hypotheses(self, pattern: Pattern, typical_causes: List[str], now: datetime) -> List[Hypothesis]:
         """Generate hypotheses for latency spikes"""
-        return [
-            Hypothesis(
-                hypothesis_id='',
-                pattern_id=pattern.pattern_id,
-                root_cause='system_load',
-                probability=0.4,
-                supporting_evidence=[f'Latency spike factor: {pattern.metrics["spike_factor"]:.1f}x'],
-                contradicting_evidence=[],
-                created_at=datetime.now()
-            ),
-            Hypothesis(
-                hypothesis_id='',
-                pattern_id=pattern.pattern_id,
-                root_cause='network_congestion',
-                probability=0.3,
-                supporting_evidence=['Latency affecting all transactions'],
-                contradicting_evidence=[],
-                created_at=datetime.now()
-            ),
-            Hypothesis(
-                hypothesis_id='',
-                pattern_id=pattern.pattern_id,
-                root_cause='downstream_slowness',
-                probability=0.3,
-                supporting_evidence=['Banks/processors may be slow'],
-                contradicting_evidence=[],
-                created_at=datetime.now()
-            )
-        ]
+        return self._instantiate_hypotheses(pattern, now)
     
-    def _generate_error_hypotheses(self, pattern: Pattern, typical_causes: List[str]) -> List[Hypothesis]:
+    def _generate_error_hypotheses(self, pattern: Pattern, typical_causes: List[str], now: datetime) -> List[Hypothesis]:
         """Generate hypotheses for error clusters"""
-        return [
-            Hypothesis(
-                hypothesis_id='',
-                pattern_id=pattern.pattern_id,
-                root_cause='specific_error_condition',
-                probability=0.6,
-                supporting_evidence=[f'Error {pattern.affected_value} highly concentrated'],
-                contradicting_evidence=[],
-                created_at=datetime.now()
-            ),
-            Hypothesis(
-                hypothesis_id='',
-                pattern_id=pattern.pattern_id,
-                root_cause='configuration_issue',
-                probability=0.4,
-                supporting_evidence=['Systematic error pattern suggests config problem'],
-                contradicting_evidence=[],
-                created_at=datetime.now()
-            )
-        ]
+        return self._instantiate_hypotheses(pattern, now)
     
-    def _generate_geographic_hypotheses(self, pattern: Pattern, typical_causes: List[str]) -> List[Hypothesis]:
+    def _generate_geographic_hypotheses(self, pattern: Pattern, typical_causes: List[str], now: datetime) -> List[Hypothesis]:
         """Generate hypotheses for geographic issues"""
-        return [
-            Hypothesis(
-                hypothesis_id='',
-                pattern_id=pattern.pattern_id,
-                root_cause='regional_network_outage',
-                probability=0.5,
-                supporting_evidence=[f'Region {pattern.affected_value} significantly degraded'],
-                contradicting_evidence=[],
-                created_at=datetime.now()
-            ),
-            Hypothesis(
-                hypothesis_id='',
-                pattern_id=pattern.pattern_id,
-                root_cause='regional_bank_issue',
-                probability=0.3,
-                supporting_evidence=['May affect specific banks in region'],
-                contradicting_evidence=[],
-                created_at=datetime.now()
-            ),
-            Hypothesis(
-                hypothesis_id='',
-                pattern_id=pattern.pattern_id,
-                root_cause='compliance_block',
-                probability=0.2,
-                supporting_evidence=['Could be regulatory/compliance issue'],
-                contradicting_evidence=[],
-                created_at=datetime.now()
-            )
-        ]
+        return self._instantiate_hypotheses(pattern, now)
     
     def update_baselines(self, observer):
         """Update baseline metrics based on recent healthy performance"""
+        aggregates = self._aggregate(observer)
+        
         # Update overall baseline
-        success_rate = observer.get_success_rate('overall', 'current')
+        success_rate = aggregates['overall_rate']
         if success_rate >= 0.90:  # Only update if healthy
             self.baselines['overall_success_rate'] = (
                 0.9 * self.baselines['overall_success_rate'] + 0.1 * success_rate
             )
         
         # Update issuer baselines
-        for issuer, health in observer.get_issuer_health().items():
-            if health['success_rate'] >= 0.90 and health['volume'] >= 20:
-                current = self.baselines['issuer_success_rates'][issuer]
-                self.baselines['issuer_success_rates'][issuer] = (
-                    0.9 * current + 0.1 * health['success_rate']
-                )
+        issuers, volumes, rates, _ = aggregates['by_issuer']
+        healthy = (rates >= 0.90) & (volumes >= 20)
+        rows = self._baseline_rows('issuer', issuers[healthy])
+        issuer_baselines = self._baseline_rates['issuer']
+        issuer_baselines[rows] = 0.9 * issuer_baselines[rows] + 0.1 * rates[healthy]
         
         # Update latency baseline
-        latency_stats = observer.get_latency_stats('overall')
+        latency_stats = aggregates['latency']
         if latency_stats['mean'] > 0:
             self.baselines['avg_latency'] = (
                 0.9 * self.baselines['avg_latency'] + 0.1 * latency_stats['mean']
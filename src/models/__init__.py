@@ -5,7 +5,9 @@ from src.models.state import (
     ActionType,
     RiskLevel,
     AuthorizationLevel,
+    PatternType,
     PaymentTransaction,
+    TransactionColumns,
     Pattern,
     Hypothesis,
     Action,
@@ -20,7 +22,9 @@ __all__ = [
     'ActionType',
     'RiskLevel',
     'AuthorizationLevel',
+    'PatternType',
     'PaymentTransaction',
+    'TransactionColumns',
     'Pattern',
     'Hypothesis',
     'Action',
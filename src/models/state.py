@@ -3,11 +3,28 @@ Agent State and Data Models
 Defines the core data structures for the payment agent system.
 """
 
-from dataclasses import dataclass, field
+import itertools
+import os
+import time
+from collections import deque
+from dataclasses import InitVar, dataclass, field
 from datetime import datetime
-from enum import Enum
-from typing import Dict, List, Optional, Set
-from uuid import uuid4
+from enum import Enum, StrEnum
+from typing import Deque, Dict, FrozenSet, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+
+from src.utils.jit import njit
+
+# Process-local ids for patterns, hypotheses and actions; the pid prefix
+# keeps ids from concurrently running agents apart.
+_ID_PREFIX = f"{os.getpid():x}"
+_ID_COUNTER = itertools.count()
+
+
+def _next_id(kind: str) -> str:
+    """Return a new id such as 'a-1f2e-00000000002a'"""
+    return f"{kind}-{_ID_PREFIX}-{next(_ID_COUNTER):012x}"
 
 
 class PaymentStatus(Enum):
@@ -52,7 +69,18 @@ class AuthorizationLevel(Enum):
     MANUAL = "manual"
 
 
-@dataclass
+class PatternType(StrEnum):
+    """Types of patterns the reasoner detects (compare equal to their string values)"""
+    ISSUER_DEGRADATION = "issuer_degradation"
+    RETRY_STORM = "retry_storm"
+    METHOD_FATIGUE = "method_fatigue"
+    LATENCY_SPIKE = "latency_spike"
+    ERROR_CLUSTER = "error_cluster"
+    GEOGRAPHIC_ISSUE = "geographic_issue"
+    TEMPORAL_PATTERN = "temporal_pattern"
+
+
+@dataclass(slots=True)
 class PaymentTransaction:
     """Represents a single payment transaction"""
     transaction_id: str
@@ -94,11 +122,11 @@ class PaymentTransaction:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class Pattern:
     """Detected pattern in payment data"""
     pattern_id: str
-    pattern_type: str
+    pattern_type: PatternType
     description: str
     severity: float  # 0.0 to 1.0
     confidence: float  # 0.0 to 1.0
@@ -106,14 +134,33 @@ class Pattern:
     affected_value: str
     metrics: Dict[str, float]
     detected_at: datetime
-    evidence: List[str] = field(default_factory=list)
+    evidence_templates: Tuple[str, ...] = ()  # formatted with metrics and affected_value
+    evidence: InitVar[Optional[List[str]]] = None  # explicit evidence skips the templates
+    _evidence: Optional[List[str]] = field(default=None, init=False, repr=False, compare=False)
     
-    def __post_init__(self):
+    def __post_init__(self, evidence: Optional[List[str]]):
         if not self.pattern_id:
-            self.pattern_id = str(uuid4())
+            self.pattern_id = _next_id("p")
+        self._evidence = evidence
+
+
+def _pattern_evidence(pattern: Pattern) -> List[str]:
+    """Evidence lines, rendered from evidence_templates on first access"""
+    if pattern._evidence is None:
+        fields = {'affected_value': pattern.affected_value, **pattern.metrics}
+        pattern._evidence = [template.format(**fields) for template in pattern.evidence_templates]
+    return pattern._evidence
+
+
+def _set_pattern_evidence(pattern: Pattern, evidence: List[str]):
+    pattern._evidence = evidence
+
 
+# Installed after the dataclass is built so `evidence` stays an init argument
+Pattern.evidence = property(_pattern_evidence, _set_pattern_evidence)
 
-@dataclass
+
+@dataclass(slots=True)
 class Hypothesis:
     """A hypothesis about why a pattern is occurring"""
     hypothesis_id: str
@@ -126,10 +173,10 @@ class Hypothesis:
     
     def __post_init__(self):
         if not self.hypothesis_id:
-            self.hypothesis_id = str(uuid4())
+            self.hypothesis_id = _next_id("h")
 
 
-@dataclass
+@dataclass(slots=True)
 class Action:
     """An action the agent can take"""
     action_id: str
@@ -148,24 +195,150 @@ class Action:
     approver: Optional[str] = None
     actual_impact: Optional[Dict[str, float]] = None
     rollback_action_id: Optional[str] = None
+    rolled_back_at: Optional[datetime] = None
     
     def __post_init__(self):
         if not self.action_id:
-            self.action_id = str(uuid4())
+            self.action_id = _next_id("a")
+
+
+# int8 codes used for enums in columnar storage
+STATUS_CODES = {status: code for code, status in enumerate(PaymentStatus)}
+METHOD_CODES = {method: code for code, method in enumerate(PaymentMethod)}
+STATUS_SUCCESS = STATUS_CODES[PaymentStatus.SUCCESS]
+STATUS_FAILED = STATUS_CODES[PaymentStatus.FAILED]
+
 
+@njit(cache=True)
+def _compute_metrics(
+    status: np.ndarray,
+    latency: np.ndarray,
+    timestamp_ns: np.ndarray,
+    since_ns: int
+) -> Tuple[int, int, int, float]:
+    """
+    Single pass over the rows stamped at or after since_ns:
+    (n, n_success, n_failed, mean positive latency, or -1.0 if none)
+    """
+    n = 0
+    n_success = 0
+    n_failed = 0
+    n_latency = 0
+    latency_sum = 0.0
+    for i in range(status.shape[0]):
+        if timestamp_ns[i] < since_ns:
+            continue
+        n += 1
+        code = status[i]
+        if code == STATUS_SUCCESS:
+            n_success += 1
+        elif code == STATUS_FAILED:
+            n_failed += 1
+        if latency[i] > 0:
+            n_latency += 1
+            latency_sum += latency[i]
+    mean_latency = latency_sum / n_latency if n_latency > 0 else -1.0
+    return n, n_success, n_failed, mean_latency
 
-@dataclass
+
+@dataclass(eq=False)
+class TransactionColumns:
+    """
+    Fixed-capacity ring buffer of transactions stored column-wise.
+    
+    Once full, new rows overwrite the oldest. Enums are stored as int8 codes
+    (STATUS_CODES, METHOD_CODES); issuers are stored as the ids the writer
+    already uses for them (PaymentObserver's issuer key ids), so the buffer
+    keeps no lookup table of its own.
+    """
+    capacity: int = 10000
+    count: int = 0  # Rows appended in total, including overwritten ones
+    
+    def __post_init__(self):
+        self.status = np.empty(self.capacity, dtype=np.int8)
+        self.method = np.empty(self.capacity, dtype=np.int8)
+        self.latency_ms = np.empty(self.capacity)
+        self.amount = np.empty(self.capacity)
+        self.timestamp_ns = np.empty(self.capacity, dtype=np.int64)
+        self.issuer_id = np.empty(self.capacity, dtype=np.int32)
+    
+    def __len__(self) -> int:
+        return min(self.count, self.capacity)
+    
+    def extend(
+        self,
+        status: np.ndarray,
+        method: np.ndarray,
+        latency_ms: np.ndarray,
+        amount: np.ndarray,
+        timestamp_ns: np.ndarray,
+        issuer_id: np.ndarray
+    ):
+        """Write a batch of rows given as equal-length columns"""
+        n = len(status)
+        keep = min(n, self.capacity)  # Rows beyond capacity would be overwritten anyway
+        slots = (self.count + n - keep + np.arange(keep)) % self.capacity
+        self.status[slots] = status[n - keep:]
+        self.method[slots] = method[n - keep:]
+        self.latency_ms[slots] = latency_ms[n - keep:]
+        self.amount[slots] = amount[n - keep:]
+        self.timestamp_ns[slots] = timestamp_ns[n - keep:]
+        self.issuer_id[slots] = issuer_id[n - keep:]
+        self.count += n
+
+
+@dataclass(slots=True)
+class HourlyCounter:
+    """
+    Event count over the last hour, kept as a ring of per-second buckets.
+    
+    Buckets are indexed by the monotonic clock in seconds; buckets the clock
+    has moved past since the last update are zeroed before use, so old
+    events fall out of the total on their own.
+    """
+    buckets: np.ndarray = field(default_factory=lambda: np.zeros(3600, dtype=np.int32), repr=False)
+    last_second: int = field(default_factory=lambda: time.monotonic_ns() // 1_000_000_000)
+    
+    def _advance(self) -> int:
+        """Zero buckets skipped since the last update; return the current second"""
+        now = time.monotonic_ns() // 1_000_000_000
+        elapsed = now - self.last_second
+        if elapsed >= len(self.buckets):
+            self.buckets[:] = 0
+        elif elapsed > 0:
+            self.buckets[np.arange(self.last_second + 1, now + 1) % len(self.buckets)] = 0
+        self.last_second = max(now, self.last_second)
+        return now
+    
+    def record(self, count: int = 1):
+        """Add events at the current second"""
+        now = self._advance()
+        self.buckets[now % len(self.buckets)] += count
+    
+    def total(self) -> int:
+        """Events recorded during the last hour"""
+        self._advance()
+        return int(self.buckets.sum())
+
+
+@dataclass(slots=True)
 class AgentMemory:
     """Agent's memory of patterns, actions, and outcomes"""
     
     # Short-term memory (current session)
-    recent_transactions: List[PaymentTransaction] = field(default_factory=list)
+    recent_transactions: TransactionColumns = field(init=False)
     active_patterns: List[Pattern] = field(default_factory=list)
-    pending_actions: List[Action] = field(default_factory=list)
+    pending_action_ids: Set[str] = field(default_factory=set)  # ids in action_history
     
     # Long-term memory (persistent)
     known_patterns: Dict[str, Pattern] = field(default_factory=dict)
-    action_history: List[Action] = field(default_factory=list)
+    _pattern_index: Dict[Tuple[str, str], List[Pattern]] = field(
+        default_factory=dict, init=False, repr=False
+    )  # known patterns by (pattern_type, affected_dimension)
+    _similar_cache: Dict[Tuple[str, str], Dict[int, List[Pattern]]] = field(
+        default_factory=dict, init=False, repr=False
+    )  # get_similar_patterns results by index key, then max_results
+    action_history: Deque[Action] = field(default_factory=lambda: deque(maxlen=10000))
     pattern_effectiveness: Dict[str, float] = field(default_factory=dict)
     
     # Learning memory
@@ -173,37 +346,58 @@ class AgentMemory:
     issuer_reliability: Dict[str, float] = field(default_factory=dict)
     method_performance: Dict[str, float] = field(default_factory=dict)
     
-    def add_transaction(self, transaction: PaymentTransaction, max_recent: int = 10000):
-        """Add transaction to recent memory"""
-        self.recent_transactions.append(transaction)
-        if len(self.recent_transactions) > max_recent:
-            self.recent_transactions = self.recent_transactions[-max_recent:]
+    # Number of recent transactions kept
+    max_recent: InitVar[int] = 10000
+    
+    def __post_init__(self, max_recent: int):
+        self.recent_transactions = TransactionColumns(capacity=max_recent)
+    
+    def add_transactions(self, **columns: np.ndarray):
+        """Add transactions to recent memory as columns (the oldest are dropped once full)"""
+        self.recent_transactions.extend(**columns)
     
     def add_pattern(self, pattern: Pattern):
         """Add detected pattern"""
         self.active_patterns.append(pattern)
+        if pattern.pattern_id not in self.known_patterns:
+            key = (pattern.pattern_type, pattern.affected_dimension)
+            self._pattern_index.setdefault(key, []).append(pattern)
+            self._similar_cache.pop(key, None)
         self.known_patterns[pattern.pattern_id] = pattern
     
     def add_action(self, action: Action):
-        """Add action to memory"""
-        self.pending_actions.append(action)
-        self.action_history.append(action)
+        """Add action to memory as pending"""
+        history = self.action_history
+        if len(history) == history.maxlen:
+            self.pending_action_ids.discard(history[0].action_id)
+        history.append(action)
+        self.pending_action_ids.add(action.action_id)
+    
+    def iter_pending(self) -> Iterator[Action]:
+        """Iterate over actions that have not completed or been rolled back"""
+        pending = self.pending_action_ids
+        return (action for action in self.action_history if action.action_id in pending)
+    
+    def resolve_action(self, action_id: str):
+        """Mark an action as no longer pending (completed or rolled back)"""
+        self.pending_action_ids.discard(action_id)
     
     def update_action_outcome(self, action_id: str, outcome: Dict[str, float]):
         """Update the outcome of an executed action"""
         self.action_outcomes[action_id] = outcome
+        self.resolve_action(action_id)
     
     def get_similar_patterns(self, pattern: Pattern, max_results: int = 5) -> List[Pattern]:
-        """Find similar patterns from history"""
-        similar = []
-        for known_pattern in self.known_patterns.values():
-            if (known_pattern.pattern_type == pattern.pattern_type and
-                known_pattern.affected_dimension == pattern.affected_dimension):
-                similar.append(known_pattern)
-        return similar[:max_results]
+        """Find similar patterns from history (cached; treat the list as read-only)"""
+        key = (pattern.pattern_type, pattern.affected_dimension)
+        cached = self._similar_cache.setdefault(key, {})
+        similar = cached.get(max_results)
+        if similar is None:
+            similar = cached[max_results] = self._pattern_index.get(key, [])[:max_results]
+        return similar
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentState:
     """Current state of the payment agent"""
     
@@ -218,16 +412,18 @@ class AgentState:
     successful_transactions: int = 0
     failed_transactions: int = 0
     
-    # Current conditions
-    active_circuit_breakers: Set[str] = field(default_factory=set)
-    suppressed_methods: Set[str] = field(default_factory=set)
+    # Current conditions (read-mostly snapshots; replaced, never mutated)
+    active_circuit_breakers: FrozenSet[str] = frozenset()
+    suppressed_methods: FrozenSet[str] = frozenset()
+    _breakers_version: int = field(default=0, init=False, repr=False)  # bumped on each replace
+    _executing_ids: Set[str] = field(default_factory=set, init=False, repr=False)  # Interventions in effect
     retry_strategies: Dict[str, Dict] = field(default_factory=dict)
     routing_overrides: Dict[str, str] = field(default_factory=dict)
     
-    # Safety metrics
-    actions_taken_last_hour: int = 0
-    rollbacks_last_hour: int = 0
-    human_overrides_last_hour: int = 0
+    # Safety metrics (self-decaying; see the *_last_hour properties)
+    _actions_window: HourlyCounter = field(default_factory=HourlyCounter, init=False, repr=False)
+    _rollbacks_window: HourlyCounter = field(default_factory=HourlyCounter, init=False, repr=False)
+    human_overrides_last_hour: int = 0  # Nothing records overrides yet
     
     # Agent performance
     patterns_detected: int = 0
@@ -236,25 +432,91 @@ class AgentState:
     actions_executed: int = 0
     actions_successful: int = 0
     
-    def update_metrics(self, transactions: List[PaymentTransaction]):
-        """Update state metrics from transactions"""
-        self.total_transactions = len(transactions)
-        self.successful_transactions = sum(
-            1 for t in transactions if t.status == PaymentStatus.SUCCESS
-        )
-        self.failed_transactions = sum(
-            1 for t in transactions if t.status == PaymentStatus.FAILED
+    def update_metrics(self, transactions: TransactionColumns, since_ns: int = 0):
+        """
+        Update state metrics from transaction columns.
+        
+        Only rows stamped at or after since_ns (epoch ns) are counted, so
+        passing the observer's window cutoff gives metrics over its sliding
+        window (limited to the rows the columns still hold).
+        """
+        n = len(transactions)
+        total, n_success, n_failed, mean_latency = _compute_metrics(
+            transactions.status[:n], transactions.latency_ms[:n],
+            transactions.timestamp_ns[:n], since_ns
         )
         
+        self.total_transactions = total
+        self.successful_transactions = n_success
+        self.failed_transactions = n_failed
+        if mean_latency >= 0:
+            self.average_latency_ms = mean_latency
+        
         if self.total_transactions > 0:
             self.overall_success_rate = self.successful_transactions / self.total_transactions
         
-        latencies = [t.latency_ms for t in transactions if t.latency_ms > 0]
-        if latencies:
-            self.average_latency_ms = sum(latencies) / len(latencies)
-        
         self.last_update = datetime.now()
     
+    @property
+    def breakers_version(self) -> int:
+        """Counter bumped whenever circuit breakers or suppressed methods change"""
+        return self._breakers_version
+    
+    def add_circuit_breaker(self, issuer: str):
+        """Open a circuit breaker for an issuer"""
+        if issuer not in self.active_circuit_breakers:
+            self.active_circuit_breakers = self.active_circuit_breakers | {issuer}
+            self._breakers_version += 1
+    
+    def remove_circuit_breaker(self, issuer: str):
+        """Close a circuit breaker for an issuer"""
+        if issuer in self.active_circuit_breakers:
+            self.active_circuit_breakers = self.active_circuit_breakers - {issuer}
+            self._breakers_version += 1
+    
+    def suppress_method(self, method: str):
+        """Suppress a payment method"""
+        if method not in self.suppressed_methods:
+            self.suppressed_methods = self.suppressed_methods | {method}
+            self._breakers_version += 1
+    
+    def unsuppress_method(self, method: str):
+        """Lift the suppression of a payment method"""
+        if method in self.suppressed_methods:
+            self.suppressed_methods = self.suppressed_methods - {method}
+            self._breakers_version += 1
+    
+    @property
+    def actions_taken_last_hour(self) -> int:
+        """Actions executed during the last hour"""
+        return self._actions_window.total()
+    
+    @property
+    def rollbacks_last_hour(self) -> int:
+        """Rollbacks during the last hour"""
+        return self._rollbacks_window.total()
+    
+    def record_action(self):
+        """Count an executed action towards the hourly limit"""
+        self._actions_window.record()
+    
+    def record_rollback(self):
+        """Count a rollback towards the hourly limit"""
+        self._rollbacks_window.record()
+    
+    @property
+    def executing_count(self) -> int:
+        """Interventions currently in effect"""
+        return len(self._executing_ids)
+    
+    def mark_executing(self, action: Action):
+        """Count an action as an intervention in effect"""
+        self._executing_ids.add(action.action_id)
+    
+    def mark_complete(self, action: Action):
+        """Stop counting an action once it completes or is rolled back (repeat calls are no-ops)"""
+        self._executing_ids.discard(action.action_id)
+    
     def can_take_action(self, action: Action) -> tuple[bool, str]:
         """Check if action is allowed based on safety constraints"""
         # Check hourly action limit
@@ -273,7 +535,7 @@ class AgentState:
         return True, "Action allowed"
 
 
-@dataclass
+@dataclass(slots=True)
 class DecisionContext:
     """Context for making a decision"""
     pattern: Pattern
@@ -5,20 +5,45 @@ Supports regulatory compliance and debugging.
 """
 
 import json
-from dataclasses import asdict, dataclass
+import math
+import os
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from itertools import islice
+from typing import Any, Deque, Dict, List, Optional
 
+try:
+    import orjson
+except ImportError:  # optional; fall back to the stdlib encoder
+    orjson = None
 
-@dataclass
+
+@dataclass(slots=True)
 class AuditEntry:
     """Single audit log entry."""
-    timestamp: str
+    timestamp_ns: int  # epoch nanoseconds; formatted as ISO 8601 when read
     event_type: str  # decision, action, rollback, pattern, error
     details: Dict[str, Any]
     outcome: Optional[str] = None
+
+
+def _entry_to_dict(entry: AuditEntry) -> Dict[str, Any]:
+    """
+    Convert an entry to a dict with an ISO 8601 timestamp in local time,
+    the same naive format as datetime.now().isoformat().
     
+    ``details`` is shared with the entry rather than deep-copied.
+    """
+    return {
+        'timestamp': datetime.fromtimestamp(entry.timestamp_ns / 1e9).isoformat(),
+        'event_type': entry.event_type,
+        'details': entry.details,
+        'outcome': entry.outcome
+    }
+
 
 class AuditLogger:
     """
@@ -33,9 +58,13 @@ class AuditLogger:
     """
     
     def __init__(self, log_dir: Optional[Path] = None):
-        self.entries: List[AuditEntry] = []
         self.log_dir = log_dir
         self.max_entries = 1000  # Keep last 1000 entries in memory
+        self.entries: Deque[AuditEntry] = deque(maxlen=self.max_entries)
+        # Per-event-type views of ``entries``, kept in step on eviction
+        self._by_type: Dict[str, Deque[AuditEntry]] = defaultdict(deque)
+        # Entries carrying an ``action_id``, grouped by that id
+        self._trail_index: Dict[str, Deque[AuditEntry]] = defaultdict(deque)
     
     def log_decision(
         self,
@@ -47,7 +76,7 @@ class AuditLogger:
     ):
         """Log a decision made by the agent."""
         entry = AuditEntry(
-            timestamp=datetime.now().isoformat(),
+            timestamp_ns=time.time_ns(),
             event_type='decision',
             details={
                 'pattern_type': pattern_type,
@@ -70,7 +99,7 @@ class AuditLogger:
     ):
         """Log an action executed by the agent."""
         entry = AuditEntry(
-            timestamp=datetime.now().isoformat(),
+            timestamp_ns=time.time_ns(),
             event_type='action',
             details={
                 'action_type': action_type,
@@ -91,7 +120,7 @@ class AuditLogger:
     ):
         """Log a rollback event."""
         entry = AuditEntry(
-            timestamp=datetime.now().isoformat(),
+            timestamp_ns=time.time_ns(),
             event_type='rollback',
             details={
                 'action_id': action_id,
@@ -111,7 +140,7 @@ class AuditLogger:
     ):
         """Log a detected pattern."""
         entry = AuditEntry(
-            timestamp=datetime.now().isoformat(),
+            timestamp_ns=time.time_ns(),
             event_type='pattern',
             details={
                 'pattern_type': pattern_type,
@@ -131,7 +160,7 @@ class AuditLogger:
     ):
         """Log the outcome of an action for learning."""
         entry = AuditEntry(
-            timestamp=datetime.now().isoformat(),
+            timestamp_ns=time.time_ns(),
             event_type='outcome',
             details={
                 'action_id': action_id,
@@ -144,24 +173,37 @@ class AuditLogger:
         self._add_entry(entry)
     
     def _add_entry(self, entry: AuditEntry):
-        """Add entry to log, maintaining size limit."""
+        """Add entry to log; the bounded deque evicts the oldest."""
+        if len(self.entries) == self.max_entries:
+            evicted = self.entries[0]
+            self._by_type[evicted.event_type].popleft()
+            evicted_id = evicted.details.get('action_id')
+            if evicted_id is not None:
+                trail = self._trail_index[evicted_id]
+                trail.popleft()
+                if not trail:
+                    del self._trail_index[evicted_id]
         self.entries.append(entry)
-        if len(self.entries) > self.max_entries:
-            self.entries = self.entries[-self.max_entries:]
+        self._by_type[entry.event_type].append(entry)
+        action_id = entry.details.get('action_id')
+        if action_id is not None:
+            self._trail_index[action_id].append(entry)
     
     def _calc_accuracy(self, predicted: Dict, actual: Dict) -> float:
         """Calculate prediction accuracy."""
-        if not predicted or not actual:
+        if not (predicted and actual):
             return 0.0
         
-        pred_rate = predicted.get('success_rate_delta', 0)
-        actual_rate = actual.get('success_rate_delta', 0)
+        pred_rate = predicted.get('success_rate_delta', 0.0)
+        actual_rate = actual.get('success_rate_delta', 0.0)
         
-        if pred_rate == 0:
-            return 1.0 if actual_rate == 0 else 0.0
+        if not pred_rate:
+            return 1.0 if not actual_rate else 0.0
         
-        accuracy = 1 - abs(pred_rate - actual_rate) / abs(pred_rate)
-        return max(0, min(1, accuracy))
+        accuracy = 1.0 - math.fabs(pred_rate - actual_rate) / math.fabs(pred_rate)
+        if accuracy < 0.0:
+            return 0.0
+        return accuracy if accuracy < 1.0 else 1.0
     
     def get_recent_entries(
         self,
@@ -169,21 +211,37 @@ class AuditLogger:
         limit: int = 50
     ) -> List[Dict]:
         """Get recent audit entries."""
-        entries = self.entries
+        source = self._by_type.get(event_type, ()) if event_type else self.entries
+        entries = islice(source, max(len(source) - limit, 0), None)
         
-        if event_type:
-            entries = [e for e in entries if e.event_type == event_type]
-        
-        return [asdict(e) for e in entries[-limit:]]
+        return [_entry_to_dict(e) for e in entries]
     
     def get_decision_trail(self, action_id: str) -> List[Dict]:
         """Get the complete decision trail for an action."""
-        return [
-            asdict(e) for e in self.entries 
-            if e.details.get('action_id') == action_id
-        ]
+        return [_entry_to_dict(e) for e in self._trail_index.get(action_id, ())]
     
     def export_to_json(self, filepath: Path):
-        """Export audit log to JSON file."""
-        with open(filepath, 'w') as f:
-            json.dump([asdict(e) for e in self.entries], f, indent=2)
+        """
+        Export audit log to JSON file.
+        
+        The JSON is written and fsynced to a temp file that then replaces
+        `filepath`, so readers (and a crash) see either the old file or the
+        complete new one. The temp file is removed if the export fails.
+        """
+        filepath = Path(filepath)
+        tmp_path = filepath.with_suffix(filepath.suffix + '.tmp')
+        try:
+            records = [_entry_to_dict(e) for e in self.entries]
+            if orjson is not None:
+                payload = orjson.dumps(records, option=orjson.OPT_INDENT_2)
+            else:
+                payload = json.dumps(records, indent=2).encode()
+            
+            with open(tmp_path, 'wb', buffering=1 << 20) as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, filepath)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
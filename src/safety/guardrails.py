@@ -20,6 +20,16 @@ class AuthorizationLevel(Enum):
     BLOCKED = "blocked"          # Action not allowed
 
 
+# Base authorization level per action type (unlisted types require manual approval)
+_AUTH_TABLE: Dict[ActionType, AuthorizationLevel] = {
+    ActionType.ADJUST_RETRY: AuthorizationLevel.AUTOMATIC,
+    ActionType.ALERT_OPS: AuthorizationLevel.AUTOMATIC,
+    ActionType.CIRCUIT_BREAKER: AuthorizationLevel.SEMI_AUTOMATIC,
+    ActionType.ROUTE_CHANGE: AuthorizationLevel.SEMI_AUTOMATIC,
+    ActionType.METHOD_SUPPRESS: AuthorizationLevel.MANUAL,
+}
+
+
 @dataclass
 class SafetyLimits:
     """Configurable safety limits for the agent."""
@@ -54,6 +64,10 @@ class SafetyGuardrails:
         self.limits = limits or SafetyLimits()
         self.action_history: List[Dict] = []
         self.blocked_reasons: List[str] = []
+        
+        # Impact thresholds read on every authorization check
+        self._manual_threshold = self.limits.manual_approve_impact_threshold
+        self._auto_threshold = self.limits.auto_approve_impact_threshold
     
     def check_action_allowed(
         self,
@@ -77,8 +91,7 @@ class SafetyGuardrails:
                 f"Too many rollbacks: {state.rollbacks_last_hour}/{self.limits.max_rollbacks_per_hour}"
         
         # Check 3: Concurrent interventions
-        active_count = len([a for a in state.active_actions 
-                           if a.status.value == 'executing'])
+        active_count = state.executing_count
         if active_count >= self.limits.max_concurrent_interventions:
             return False, AuthorizationLevel.BLOCKED, \
                 f"Too many concurrent interventions: {active_count}"
@@ -102,24 +115,14 @@ class SafetyGuardrails:
     
     def _determine_authorization(self, action: Action) -> AuthorizationLevel:
         """Determine the required authorization level for an action."""
-        
-        # Map action types to base authorization levels
-        action_auth_map = {
-            ActionType.ADJUST_RETRY: AuthorizationLevel.AUTOMATIC,
-            ActionType.ALERT_OPS: AuthorizationLevel.AUTOMATIC,
-            ActionType.CIRCUIT_BREAKER: AuthorizationLevel.SEMI_AUTOMATIC,
-            ActionType.ROUTE_CHANGE: AuthorizationLevel.SEMI_AUTOMATIC,
-            ActionType.METHOD_SUPPRESS: AuthorizationLevel.MANUAL,
-        }
-        
-        base_level = action_auth_map.get(action.action_type, AuthorizationLevel.MANUAL)
+        base_level = _AUTH_TABLE.get(action.action_type, AuthorizationLevel.MANUAL)
         
         # Escalate based on estimated impact
         impact = action.estimated_impact.get('traffic_affected_percent', 0)
         
-        if impact > self.limits.manual_approve_impact_threshold:
+        if impact > self._manual_threshold:
             return AuthorizationLevel.MANUAL
-        elif impact > self.limits.auto_approve_impact_threshold:
+        elif impact > self._auto_threshold:
             if base_level == AuthorizationLevel.AUTOMATIC:
                 return AuthorizationLevel.SEMI_AUTOMATIC
         
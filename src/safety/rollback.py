@@ -5,6 +5,7 @@ Implements the problem statement requirement:
 "how incorrect decisions are detected and rolled back"
 """
 
+import time
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
@@ -41,6 +42,10 @@ class RollbackManager:
         self.thresholds = thresholds or RollbackThresholds()
         self.baseline_metrics: Dict = {}
         self.rollback_history: List[Dict] = []
+        
+        # Derived from the baseline in set_baseline
+        self._baseline_success = 0.0
+        self._inv_baseline_latency_pct = 0.0  # 100 / baseline latency, 0 if unknown
     
     def set_baseline(self, metrics: Dict):
         """Set baseline metrics before an action is executed."""
@@ -49,8 +54,12 @@ class RollbackManager:
             'avg_latency_ms': metrics.get('avg_latency_ms', 200),
             'error_rate': metrics.get('error_rate', 0.05),
             'cost_per_txn': metrics.get('cost_per_txn', 0.10),
-            'timestamp': datetime.now()
+            'timestamp_ns': time.monotonic_ns()  # for age comparisons only
         }
+        
+        baseline_latency = self.baseline_metrics['avg_latency_ms']
+        self._baseline_success = self.baseline_metrics['success_rate']
+        self._inv_baseline_latency_pct = 100.0 / baseline_latency if baseline_latency > 0 else 0.0
     
     def check_rollback_needed(
         self,
@@ -69,17 +78,17 @@ class RollbackManager:
         baseline = self.baseline_metrics
         
         # Check 1: Success rate dropped
-        success_drop = baseline['success_rate'] - current_metrics.get('success_rate', 0)
+        success_drop = self._baseline_success - current_metrics.get('success_rate', 0)
         if success_drop > self.thresholds.success_rate_drop:
             reason = f"Success rate dropped by {success_drop:.1%} (threshold: {self.thresholds.success_rate_drop:.1%})"
             self._record_rollback(action, reason)
             return True, reason
         
         # Check 2: Latency increased
-        if baseline['avg_latency_ms'] > 0:
+        if self._inv_baseline_latency_pct > 0:
             latency_increase = (
-                (current_metrics.get('avg_latency_ms', 0) - baseline['avg_latency_ms']) 
-                / baseline['avg_latency_ms'] * 100
+                (current_metrics.get('avg_latency_ms', 0) - baseline['avg_latency_ms'])
+                * self._inv_baseline_latency_pct
             )
             if latency_increase > self.thresholds.latency_increase_percent:
                 reason = f"Latency increased by {latency_increase:.0f}% (threshold: {self.thresholds.latency_increase_percent:.0f}%)"
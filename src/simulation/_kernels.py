@@ -0,0 +1,90 @@
+"""
+Simulation Kernels
+Numba-compiled per-transaction scoring for PaymentSimulator's batch path.
+
+Random inputs are drawn by the caller (from the simulator's NumPy generator)
+and passed in as arrays, so the kernel is deterministic given its inputs and
+runs unchanged, if slowly, when Numba is not installed.
+"""
+
+import numpy as np
+
+from src.utils.jit import njit
+
+# Scenario type codes (see PaymentSimulator._reindex_scenarios)
+SCENARIO_ISSUER_DEGRADATION = 0
+SCENARIO_METHOD_FATIGUE = 1
+SCENARIO_GEOGRAPHIC_FAILURE = 2
+SCENARIO_RETRY_STORM = 3
+SCENARIO_LATENCY_SPIKE = 4
+
+
+@njit(cache=True)
+def score_batch(
+    issuer_idx: np.ndarray,
+    method_idx: np.ndarray,
+    region_idx: np.ndarray,
+    is_retry: np.ndarray,
+    scenario_types: np.ndarray,
+    scenario_targets: np.ndarray,
+    scenario_severity: np.ndarray,
+    base_success_rate: float,
+    issuer_down_idx: int,
+    outcome_uniforms: np.ndarray,
+    error_draws: np.ndarray,
+    issuer_down_uniforms: np.ndarray,
+    latency_normals: np.ndarray,
+    fast_fail_uniforms: np.ndarray,
+    success_out: np.ndarray,
+    error_out: np.ndarray,
+    latency_out: np.ndarray
+):
+    """
+    Score a batch of transactions against the active scenarios.
+
+    Writes the outcome (success_out), error code index (error_out, only
+    meaningful for failures) and latency in ms (latency_out) of each row.
+    """
+    n_scenarios = scenario_types.shape[0]
+    for i in range(issuer_idx.shape[0]):
+        retry = is_retry[i]
+        success_prob = base_success_rate
+        latency_scale = 1.0
+        issuer_down_miss = 1.0  # chance no degradation relabels a failure
+
+        for s in range(n_scenarios):
+            kind = scenario_types[s]
+            target = scenario_targets[s]
+            if kind == SCENARIO_ISSUER_DEGRADATION:
+                if issuer_idx[i] == target:
+                    success_prob *= 1.0 - scenario_severity[s]
+                    issuer_down_miss *= 0.3
+            elif kind == SCENARIO_METHOD_FATIGUE:
+                if retry and method_idx[i] == target:
+                    success_prob *= 1.0 - scenario_severity[s]
+            elif kind == SCENARIO_GEOGRAPHIC_FAILURE:
+                if region_idx[i] == target:
+                    success_prob *= 1.0 - scenario_severity[s]
+                    latency_scale *= 2.0
+            elif kind == SCENARIO_RETRY_STORM:
+                if retry:
+                    success_prob *= 0.5
+            elif kind == SCENARIO_LATENCY_SPIKE:
+                latency_scale *= scenario_severity[s]
+
+        if retry:
+            success_prob *= 0.7
+
+        success = outcome_uniforms[i] < success_prob
+        success_out[i] = success
+
+        error_code = error_draws[i]
+        if not success and issuer_down_uniforms[i] < 1.0 - issuer_down_miss:
+            error_code = issuer_down_idx
+        error_out[i] = error_code
+
+        latency = 200.0 + 50.0 * latency_normals[i]
+        if not success and fast_fail_uniforms[i] < 0.5:
+            latency *= 0.5  # Failed transactions are often faster (immediate reject)
+        latency *= latency_scale
+        latency_out[i] = latency if latency > 10.0 else 10.0
@@ -3,12 +3,92 @@ Payment Simulator
 Generates realistic payment transaction streams with various failure scenarios.
 """
 
+import itertools
+import math
+import multiprocessing
+import os
 import random
+import time
 from datetime import datetime, timedelta
-from typing import Dict, List
-from uuid import uuid4
+from typing import Callable, Dict, Iterator, List, Optional
+
+import numpy as np
 
 from src.models.state import PaymentMethod, PaymentStatus, PaymentTransaction
+from src.simulation._kernels import (
+    SCENARIO_GEOGRAPHIC_FAILURE,
+    SCENARIO_ISSUER_DEGRADATION,
+    SCENARIO_LATENCY_SPIKE,
+    SCENARIO_METHOD_FATIGUE,
+    SCENARIO_RETRY_STORM,
+    score_batch,
+)
+
+
+# Scenario type codes for the struct-of-arrays scenario view
+_SCENARIO_CODES = {
+    'issuer_degradation': SCENARIO_ISSUER_DEGRADATION,
+    'method_fatigue': SCENARIO_METHOD_FATIGUE,
+    'geographic_failure': SCENARIO_GEOGRAPHIC_FAILURE,
+    'retry_storm': SCENARIO_RETRY_STORM,
+    'latency_spike': SCENARIO_LATENCY_SPIKE,
+}
+
+
+class _AliasSampler:
+    """
+    Vose alias table for O(1) sampling from a fixed discrete distribution.
+    
+    Each of the n columns holds an acceptance probability and an alias:
+    drawing u in [0, n), column int(u) is kept if the fractional part of u
+    is below its probability, otherwise its alias is returned.
+    """
+    
+    def __init__(self, weights: List[float]):
+        n = len(weights)
+        total = sum(weights)
+        scaled = [weight * n / total for weight in weights]
+        self.n = n
+        self.prob = [1.0] * n
+        self.alias = list(range(n))
+        
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            small_idx, large_idx = small.pop(), large.pop()
+            self.prob[small_idx] = scaled[small_idx]
+            self.alias[small_idx] = large_idx
+            scaled[large_idx] -= 1.0 - scaled[small_idx]
+            (small if scaled[large_idx] < 1.0 else large).append(large_idx)
+        # Leftovers are 1.0 up to rounding and keep their own column
+        
+        self.prob_arr = np.array(self.prob)
+        self.alias_arr = np.array(self.alias)
+    
+    def sample(self, rand: Callable[[], float] = random.random) -> int:
+        """Draw one index using a single rand() call"""
+        u = rand() * self.n
+        i = int(u)
+        return i if u - i < self.prob[i] else self.alias[i]
+    
+    def sample_array(self, rng: np.random.Generator, count: int) -> np.ndarray:
+        """Draw count indices with a NumPy generator"""
+        u = rng.random(count) * self.n
+        i = u.astype(np.intp)
+        return np.where(u - i < self.prob_arr[i], i, self.alias_arr[i])
+
+
+def _stream_worker(args: tuple) -> List[PaymentTransaction]:
+    """Generate one chunk of generate_stream_parallel in a worker process"""
+    base_success_rate, failure_scenarios, deadlines, seed_seq, count, start_time = args
+    simulator = PaymentSimulator(base_success_rate=base_success_rate)
+    simulator.failure_scenarios = failure_scenarios
+    simulator._scenario_deadlines = deadlines
+    simulator._reindex_scenarios()
+    
+    simulator._random = random.Random(int(seed_seq.generate_state(1)[0]))
+    simulator._rng = np.random.default_rng(seed_seq)
+    return simulator.generate_stream(count, start_time)
 
 
 class PaymentSimulator:
@@ -22,9 +102,21 @@ class PaymentSimulator:
     - Payment method fatigue
     - Geographic failures
     - Latency spikes
+    
+    Active scenarios live in `failure_scenarios`, keyed by scenario id. The
+    generators read indexed views of that dict, so code that edits it
+    directly (rather than through inject_*/clear_scenarios) must call
+    _reindex_scenarios() afterwards.
     """
     
-    def __init__(self, base_success_rate: float = 0.95):
+    def __init__(self, base_success_rate: float = 0.95, seed: Optional[int] = None):
+        """
+        Args:
+            base_success_rate: Success probability with no scenarios active
+            seed: Seed for the NumPy generator behind generate_stream_vectorized.
+                The per-transaction path draws from the `random` module, so
+                random.seed() reproduces generate_stream as before.
+        """
         self.base_success_rate = base_success_rate
         
         # Available issuers
@@ -42,6 +134,10 @@ class PaymentSimulator:
             (PaymentMethod.WALLET, 0.03)
         ]
         
+        # Alias table for O(1) weighted method sampling
+        self._methods = tuple(method for method, _ in self.payment_methods)
+        self._method_sampler = _AliasSampler([weight for _, weight in self.payment_methods])
+        
         # Regions
         self.regions = ['NORTH', 'SOUTH', 'EAST', 'WEST', 'CENTRAL']
         
@@ -60,11 +156,59 @@ class PaymentSimulator:
             'FRAUD_SUSPECTED'
         ]
         
-        # Active failure scenarios
+        # Positions used by the array-based scenario view
+        self._issuer_idx = {issuer: i for i, issuer in enumerate(self.issuers)}
+        self._region_idx = {region: i for i, region in enumerate(self.regions)}
+        self._method_idx = {method: i for i, method in enumerate(self._methods)}
+        self._issuer_down_idx = self.error_codes.index('ISSUER_DOWN')
+        
+        # Active failure scenarios, and the time.monotonic() deadline of
+        # each by scenario id (kept out of the public scenario dicts)
         self.failure_scenarios = {}
+        self._scenario_deadlines: Dict[str, float] = {}
+        
+        # Per-type views of failure_scenarios for the per-transaction path,
+        # indexed by issuer/method/region position and rebuilt by
+        # _reindex_scenarios whenever the scenario set changes
+        self._issuer_factor: List[float] = []  # product of (1 - severity)
+        self._issuer_down_prob: List[float] = []  # chance a failure reports ISSUER_DOWN
+        self._retry_method_factor: List[float] = []  # applies to retries
+        self._region_factor: List[float] = []
+        self._region_latency: List[float] = []  # 2x per geographic failure
+        self._retry_factor = 1.0  # 0.5 per retry storm
+        self._latency_multiplier = 1.0
+        self._next_expiry = math.inf  # time.monotonic() of the earliest expiry
+        
+        # The same scenarios as parallel arrays for the batch path: type code,
+        # target position (issuer/region/method, -1 if none or unknown),
+        # and severity (multiplier for latency spikes)
+        self._scenario_types = np.empty(0, dtype=np.int8)
+        self._scenario_targets = np.empty(0, dtype=np.int16)
+        self._scenario_severity = np.empty(0, dtype=np.float64)
+        self._reindex_scenarios()
         
         # Transaction counter
         self.transaction_count = 0
+        
+        # Source of draws for the per-transaction path; the shared `random`
+        # module unless a caller swaps in its own random.Random
+        self._random = random
+        
+        # NumPy generator for batch sampling (generate_stream_vectorized)
+        self._rng = np.random.default_rng(seed)
+        
+        # Random bytes consumed 16 at a time for transaction ids
+        self._id_pool = b''
+        self._id_offset = 0
+    
+    def _next_id(self) -> str:
+        """Return a random 128-bit hex id drawn from a pooled os.urandom buffer"""
+        offset = self._id_offset
+        if offset >= len(self._id_pool):
+            self._id_pool = os.urandom(16 * 4096)
+            offset = 0
+        self._id_offset = offset + 16
+        return self._id_pool[offset:offset + 16].hex()
     
     def generate_transaction(
         self,
@@ -74,35 +218,42 @@ class PaymentSimulator:
         """Generate a single payment transaction"""
         if timestamp is None:
             timestamp = datetime.now()
+        if time.monotonic() >= self._next_expiry:
+            self.cleanup_expired_scenarios()
         
         self.transaction_count += 1
         
+        rng = self._random
+        rand = rng.random
+        
         # Select payment method (weighted random)
-        methods, weights = zip(*self.payment_methods)
-        payment_method = random.choices(methods, weights=weights)[0]
+        method_i = self._method_sampler.sample(rand)
+        payment_method = self._methods[method_i]
         
-        # Select other attributes
-        issuer = random.choice(self.issuers)
-        region = random.choice(self.regions)
-        merchant = random.choice(self.merchants)
+        # Select other attributes by position (uniform, like random.choice)
+        issuer_i = int(rand() * len(self.issuers))
+        region_i = int(rand() * len(self.regions))
+        issuer = self.issuers[issuer_i]
+        region = self.regions[region_i]
+        merchant = self.merchants[int(rand() * len(self.merchants))]
         
         # Determine if this is a retry
-        is_retry = force_retry or random.random() < 0.05  # 5% base retry rate
-        retry_count = random.randint(1, 3) if is_retry else 0
+        is_retry = force_retry or rand() < 0.05  # 5% base retry rate
+        retry_count = rng.randint(1, 3) if is_retry else 0
         
         # Calculate success/failure based on scenarios
         status, error_code, error_message = self._determine_outcome(
-            issuer, payment_method, region, is_retry
+            issuer_i, method_i, region_i, is_retry
         )
         
         # Generate latency
-        latency_ms = self._generate_latency(status, issuer, region)
+        latency_ms = self._generate_latency(status, region_i)
         
         # Generate amount
-        amount = round(random.lognormvariate(6, 1.5), 2)  # Log-normal distribution
+        amount = round(rng.lognormvariate(6, 1.5), 2)  # Log-normal distribution
         
         return PaymentTransaction(
-            transaction_id=str(uuid4()),
+            transaction_id=self._next_id(),
             timestamp=timestamp,
             amount=amount,
             currency='INR',
@@ -115,7 +266,7 @@ class PaymentSimulator:
             latency_ms=latency_ms,
             retry_count=retry_count,
             is_retry=is_retry,
-            original_transaction_id=str(uuid4()) if is_retry else None,
+            original_transaction_id=self._next_id() if is_retry else None,
             region=region,
             processor='default'
         )
@@ -126,64 +277,198 @@ class PaymentSimulator:
         start_time: datetime = None
     ) -> List[PaymentTransaction]:
         """Generate a stream of transactions"""
+        return list(self.iter_stream(count, start_time))
+    
+    def iter_stream(
+        self,
+        count: int,
+        start_time: datetime = None
+    ) -> Iterator[PaymentTransaction]:
+        """
+        Yield a stream of transactions one at a time.
+        
+        Same transactions as generate_stream without materializing the list.
+        """
         if start_time is None:
             start_time = datetime.now()
         
-        transactions = []
+        uniform = self._random.uniform
         for i in range(count):
             # Spread transactions over time (one per second on average)
-            timestamp = start_time + timedelta(seconds=i + random.uniform(-0.5, 0.5))
-            transaction = self.generate_transaction(timestamp)
-            transactions.append(transaction)
+            offset = timedelta(seconds=i + uniform(-0.5, 0.5))
+            yield self.generate_transaction(start_time + offset)
+    
+    def generate_stream_parallel(
+        self,
+        count: int,
+        processes: Optional[int] = None,
+        start_time: datetime = None,
+        seed: Optional[int] = None
+    ) -> List[PaymentTransaction]:
+        """
+        Generate a stream of transactions across worker processes.
+        
+        The count is split into one contiguous chunk per process. Workers
+        build their own simulator from this one's base_success_rate and a
+        snapshot of failure_scenarios taken now (scenarios injected later are
+        not seen), each seeded from an independent child of `seed`.
+        Transaction ids come from each worker's own urandom pool, so they
+        stay unique without coordination.
+        """
+        if start_time is None:
+            start_time = datetime.now()
+        processes = processes or os.cpu_count() or 1
+        processes = max(1, min(processes, count))
+        if count <= 0:
+            return []
+        
+        base, extra = divmod(count, processes)
+        sizes = [base + (i < extra) for i in range(processes)]
+        starts = itertools.accumulate(sizes, initial=0)
+        seeds = np.random.SeedSequence(seed).spawn(processes)
+        chunks = [
+            (self.base_success_rate, dict(self.failure_scenarios), dict(self._scenario_deadlines),
+             seed_seq, size, start_time + timedelta(seconds=chunk_start))
+            for seed_seq, size, chunk_start in zip(seeds, sizes, starts)
+        ]
+        
+        if processes == 1:
+            results = [_stream_worker(chunks[0])]
+        else:
+            with multiprocessing.Pool(processes) as pool:
+                results = pool.map(_stream_worker, chunks)
+        
+        self.transaction_count += count
+        return list(itertools.chain.from_iterable(results))
+    
+    def generate_stream_vectorized(
+        self,
+        count: int,
+        start_time: datetime = None
+    ) -> List[PaymentTransaction]:
+        """
+        Generate a stream of transactions with all random draws made in NumPy.
+        
+        Follows the same distributions as generate_stream, but samples every
+        attribute, outcome and latency for the whole batch at once and only
+        loops in Python to build the transaction objects.
+        """
+        if start_time is None:
+            start_time = datetime.now()
+        if count <= 0:
+            return []
+        
+        if time.monotonic() >= self._next_expiry:
+            self.cleanup_expired_scenarios()
+        
+        rng = self._rng
+        self.transaction_count += count
+        
+        # Attributes
+        method_idx = self._method_sampler.sample_array(rng, count)
+        issuer_idx = rng.integers(len(self.issuers), size=count)
+        region_idx = rng.integers(len(self.regions), size=count)
+        merchant_idx = rng.integers(len(self.merchants), size=count)
+        is_retry = rng.random(count) < 0.05  # 5% base retry rate
+        retry_counts = np.where(is_retry, rng.integers(1, 4, size=count), 0)
+        
+        success, error_idx, latencies = self._score_batch(
+            issuer_idx, method_idx, region_idx, is_retry
+        )
+        amounts = np.round(rng.lognormal(6, 1.5, count), 2)
+        offsets = np.arange(count) + rng.uniform(-0.5, 0.5, count)
+        
+        methods = self._methods
+        issuers = self.issuers
+        regions = self.regions
+        merchants = self.merchants
+        error_codes = self.error_codes
+        
+        transactions = []
+        for m, i, r, mer, retry, n_retry, ok, err, latency, amount, offset in zip(
+            method_idx.tolist(), issuer_idx.tolist(), region_idx.tolist(),
+            merchant_idx.tolist(), is_retry.tolist(), retry_counts.tolist(),
+            success.tolist(), error_idx.tolist(), latencies.tolist(),
+            amounts.tolist(), offsets.tolist()
+        ):
+            error_code = None if ok else error_codes[err]
+            transactions.append(PaymentTransaction(
+                transaction_id=self._next_id(),
+                timestamp=start_time + timedelta(seconds=offset),
+                amount=amount,
+                currency='INR',
+                payment_method=methods[m],
+                issuer=issuers[i],
+                merchant_id=merchants[mer],
+                status=PaymentStatus.SUCCESS if ok else PaymentStatus.FAILED,
+                error_code=error_code,
+                error_message=None if ok else f"{error_code}: Transaction declined",
+                latency_ms=latency,
+                retry_count=n_retry,
+                is_retry=retry,
+                original_transaction_id=self._next_id() if retry else None,
+                region=regions[r],
+                processor='default'
+            ))
         
         return transactions
     
+    def _score_batch(
+        self,
+        issuer_idx: np.ndarray,
+        method_idx: np.ndarray,
+        region_idx: np.ndarray,
+        is_retry: np.ndarray
+    ) -> tuple:
+        """Score a batch with score_batch: (success mask, error code indices, latencies)"""
+        rng = self._rng
+        count = len(issuer_idx)
+        success = np.empty(count, dtype=np.bool_)
+        error_idx = np.empty(count, dtype=np.int64)
+        latencies = np.empty(count)
+        
+        score_batch(
+            issuer_idx, method_idx, region_idx, is_retry,
+            self._scenario_types, self._scenario_targets, self._scenario_severity,
+            self.base_success_rate, self._issuer_down_idx,
+            rng.random(count), rng.integers(len(self.error_codes), size=count),
+            rng.random(count), rng.standard_normal(count), rng.random(count),
+            success, error_idx, latencies
+        )
+        return success, error_idx, latencies
+    
     def _determine_outcome(
         self,
-        issuer: str,
-        payment_method: PaymentMethod,
-        region: str,
+        issuer_i: int,
+        method_i: int,
+        region_i: int,
         is_retry: bool
     ) -> tuple:
-        """Determine if transaction succeeds or fails"""
-        
-        # Base success rate
-        success_prob = self.base_success_rate
+        """Determine if transaction succeeds or fails (attributes given by position)"""
         
-        # Apply failure scenarios
-        for scenario_name, scenario in self.failure_scenarios.items():
-            if scenario['type'] == 'issuer_degradation':
-                if issuer == scenario['issuer']:
-                    success_prob *= (1 - scenario['severity'])
-            
-            elif scenario['type'] == 'method_fatigue':
-                if payment_method == scenario['method'] and is_retry:
-                    success_prob *= (1 - scenario['severity'])
-            
-            elif scenario['type'] == 'geographic_failure':
-                if region == scenario['region']:
-                    success_prob *= (1 - scenario['severity'])
-            
-            elif scenario['type'] == 'retry_storm':
-                if is_retry:
-                    success_prob *= 0.5  # Retries much less likely to succeed
+        # Base success rate, scaled by the scenarios affecting this transaction
+        success_prob = (
+            self.base_success_rate
+            * self._issuer_factor[issuer_i]
+            * self._region_factor[region_i]
+        )
         
-        # Retries have lower success rate in general
+        # Retries have lower success rate in general, and much lower in a retry storm
         if is_retry:
-            success_prob *= 0.7
+            success_prob *= 0.7 * self._retry_factor * self._retry_method_factor[method_i]
         
         # Determine outcome
-        if random.random() < success_prob:
+        rand = self._random.random
+        if rand() < success_prob:
             return PaymentStatus.SUCCESS, None, None
         else:
             # Failed - pick error code
-            error_code = random.choice(self.error_codes)
+            error_code = self.error_codes[int(rand() * len(self.error_codes))]
             
             # Special error codes for scenarios
-            for scenario in self.failure_scenarios.values():
-                if scenario['type'] == 'issuer_degradation':
-                    if issuer == scenario['issuer'] and random.random() < 0.7:
-                        error_code = 'ISSUER_DOWN'
+            issuer_down_prob = self._issuer_down_prob[issuer_i]
+            if issuer_down_prob and rand() < issuer_down_prob:
+                error_code = 'ISSUER_DOWN'
             
             error_message = f"{error_code}: Transaction declined"
             return PaymentStatus.FAILED, error_code, error_message
@@ -191,8 +476,7 @@ class PaymentSimulator:
     def _generate_latency(
         self,
         status: PaymentStatus,
-        issuer: str,
-        region: str
+        region_i: int
     ) -> float:
         """Generate realistic latency"""
         
@@ -200,21 +484,15 @@ class PaymentSimulator:
         base_latency = 200  # 200ms base
         
         # Add randomness
-        latency = base_latency + random.gauss(0, 50)
+        latency = base_latency + self._random.gauss(0, 50)
         
         # Failed transactions are often faster (immediate reject)
         if status == PaymentStatus.FAILED:
-            if random.random() < 0.5:
+            if self._random.random() < 0.5:
                 latency *= 0.5
         
-        # Apply latency spike scenarios
-        for scenario in self.failure_scenarios.values():
-            if scenario['type'] == 'latency_spike':
-                latency *= scenario['multiplier']
-            
-            elif scenario['type'] == 'geographic_failure':
-                if region == scenario['region']:
-                    latency *= 2.0
+        # Apply latency spike and geographic failure scenarios
+        latency *= self._latency_multiplier * self._region_latency[region_i]
         
         return max(10, latency)  # Minimum 10ms
     
@@ -234,24 +512,18 @@ class PaymentSimulator:
             severity: How bad (0.0-1.0, where 1.0 = complete failure)
             duration_seconds: How long the degradation lasts
         """
-        scenario_id = f'issuer_deg_{issuer}_{datetime.now().timestamp()}'
-        self.failure_scenarios[scenario_id] = {
+        self._add_scenario(f'issuer_deg_{issuer}', {
             'type': 'issuer_degradation',
             'issuer': issuer,
-            'severity': severity,
-            'injected_at': datetime.now(),
-            'expires_at': datetime.now() + timedelta(seconds=duration_seconds)
-        }
+            'severity': severity
+        }, duration_seconds)
         print(f"🔥 Injected issuer degradation: {issuer} at {severity:.0%} severity for {duration_seconds}s")
     
     def inject_retry_storm(self, duration_seconds: int = 180):
         """Inject retry storm scenario"""
-        scenario_id = f'retry_storm_{datetime.now().timestamp()}'
-        self.failure_scenarios[scenario_id] = {
-            'type': 'retry_storm',
-            'injected_at': datetime.now(),
-            'expires_at': datetime.now() + timedelta(seconds=duration_seconds)
-        }
+        self._add_scenario('retry_storm', {
+            'type': 'retry_storm'
+        }, duration_seconds)
         print(f"🔥 Injected retry storm for {duration_seconds}s")
     
     def inject_method_fatigue(
@@ -261,14 +533,11 @@ class PaymentSimulator:
         duration_seconds: int = 240
     ):
         """Inject payment method fatigue"""
-        scenario_id = f'method_fatigue_{method.value}_{datetime.now().timestamp()}'
-        self.failure_scenarios[scenario_id] = {
+        self._add_scenario(f'method_fatigue_{method.value}', {
             'type': 'method_fatigue',
             'method': method,
-            'severity': severity,
-            'injected_at': datetime.now(),
-            'expires_at': datetime.now() + timedelta(seconds=duration_seconds)
-        }
+            'severity': severity
+        }, duration_seconds)
         print(f"🔥 Injected method fatigue: {method.value} at {severity:.0%} severity for {duration_seconds}s")
     
     def inject_geographic_failure(
@@ -278,14 +547,11 @@ class PaymentSimulator:
         duration_seconds: int = 200
     ):
         """Inject geographic failure"""
-        scenario_id = f'geo_failure_{region}_{datetime.now().timestamp()}'
-        self.failure_scenarios[scenario_id] = {
+        self._add_scenario(f'geo_failure_{region}', {
             'type': 'geographic_failure',
             'region': region,
-            'severity': severity,
-            'injected_at': datetime.now(),
-            'expires_at': datetime.now() + timedelta(seconds=duration_seconds)
-        }
+            'severity': severity
+        }, duration_seconds)
         print(f"🔥 Injected geographic failure: {region} at {severity:.0%} severity for {duration_seconds}s")
     
     def inject_latency_spike(
@@ -294,28 +560,115 @@ class PaymentSimulator:
         duration_seconds: int = 150
     ):
         """Inject latency spike"""
-        scenario_id = f'latency_spike_{datetime.now().timestamp()}'
-        self.failure_scenarios[scenario_id] = {
+        self._add_scenario('latency_spike', {
             'type': 'latency_spike',
-            'multiplier': multiplier,
-            'injected_at': datetime.now(),
-            'expires_at': datetime.now() + timedelta(seconds=duration_seconds)
-        }
+            'multiplier': multiplier
+        }, duration_seconds)
         print(f"🔥 Injected latency spike: {multiplier}x for {duration_seconds}s")
     
+    def _add_scenario(self, name: str, scenario: Dict, duration_seconds: int):
+        """Register a scenario under a timestamped id and refresh the indexes"""
+        now = datetime.now()
+        scenario['injected_at'] = now
+        scenario['expires_at'] = now + timedelta(seconds=duration_seconds)
+        scenario_id = f'{name}_{now.timestamp()}'
+        self.failure_scenarios[scenario_id] = scenario
+        self._scenario_deadlines[scenario_id] = time.monotonic() + duration_seconds
+        self._reindex_scenarios()
+    
+    def _reindex_scenarios(self):
+        """
+        Rebuild the per-type scenario views from failure_scenarios.
+        
+        The inject_*, clear and cleanup methods call this themselves; code
+        that changes failure_scenarios directly must call it afterwards.
+        Scenarios added that way have no deadline and never expire.
+        """
+        deadlines = self._scenario_deadlines
+        self._scenario_deadlines = deadlines = {
+            scenario_id: deadlines[scenario_id]
+            for scenario_id in self.failure_scenarios if scenario_id in deadlines
+        }
+        issuer_factor = [1.0] * len(self.issuers)
+        issuer_hits = [0] * len(self.issuers)
+        retry_method_factor = [1.0] * len(self._methods)
+        region_factor = [1.0] * len(self.regions)
+        region_latency = [1.0] * len(self.regions)
+        retry_factor = 1.0
+        latency_multiplier = 1.0
+        
+        for scenario in self.failure_scenarios.values():
+            kind = scenario['type']
+            target = self._scenario_target(scenario)
+            if kind == 'retry_storm':
+                retry_factor *= 0.5  # Retries much less likely to succeed
+            elif kind == 'latency_spike':
+                latency_multiplier *= scenario['multiplier']
+            elif target < 0:
+                continue  # targets an issuer/region/method that is never generated
+            elif kind == 'issuer_degradation':
+                issuer_factor[target] *= 1 - scenario['severity']
+                issuer_hits[target] += 1
+            elif kind == 'method_fatigue':
+                retry_method_factor[target] *= 1 - scenario['severity']
+            elif kind == 'geographic_failure':
+                region_factor[target] *= 1 - scenario['severity']
+                region_latency[target] *= 2.0
+        
+        self._issuer_factor = issuer_factor
+        # Each degradation independently relabels 70% of the issuer's failures
+        self._issuer_down_prob = [1 - 0.3 ** hits for hits in issuer_hits]
+        self._retry_method_factor = retry_method_factor
+        self._region_factor = region_factor
+        self._region_latency = region_latency
+        self._retry_factor = retry_factor
+        self._latency_multiplier = latency_multiplier
+        self._next_expiry = min(deadlines.values(), default=math.inf)
+        
+        scenarios = list(self.failure_scenarios.values())
+        self._scenario_types = np.array(
+            [_SCENARIO_CODES[scenario['type']] for scenario in scenarios], dtype=np.int8
+        )
+        self._scenario_targets = np.array(
+            [self._scenario_target(scenario) for scenario in scenarios], dtype=np.int16
+        )
+        self._scenario_severity = np.array(
+            [scenario.get('severity', scenario.get('multiplier', 0.0)) for scenario in scenarios],
+            dtype=np.float64
+        )
+    
+    def _scenario_target(self, scenario: Dict) -> int:
+        """Position of the issuer, region or method a scenario targets (-1 if none)"""
+        if 'issuer' in scenario:
+            return self._issuer_idx.get(scenario['issuer'], -1)
+        if 'region' in scenario:
+            return self._region_idx.get(scenario['region'], -1)
+        if 'method' in scenario:
+            return self._method_idx.get(scenario['method'], -1)
+        return -1
+    
+    def clear_scenarios(self) -> int:
+        """Remove all failure scenarios; returns how many were active"""
+        count = len(self.failure_scenarios)
+        self.failure_scenarios.clear()
+        self._reindex_scenarios()
+        return count
+    
     def cleanup_expired_scenarios(self):
         """Remove expired failure scenarios"""
-        now = datetime.now()
+        now = time.monotonic()
         expired = [
             scenario_id
-            for scenario_id, scenario in self.failure_scenarios.items()
-            if scenario['expires_at'] < now
+            for scenario_id, deadline in self._scenario_deadlines.items()
+            if deadline < now and scenario_id in self.failure_scenarios
         ]
         
         for scenario_id in expired:
             scenario = self.failure_scenarios[scenario_id]
             print(f"✅ Scenario expired: {scenario['type']}")
             del self.failure_scenarios[scenario_id]
+        
+        self._reindex_scenarios()
     
     def get_active_scenarios(self) -> List[Dict]:
         """Get list of currently active failure scenarios"""
@@ -3,21 +3,33 @@ Configuration Loader Utility
 Loads YAML configuration files for the Payment Agent System.
 """
 
+import copy
 import os
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 import yaml
 
+try:
+    _YamlLoader = yaml.CSafeLoader
+except AttributeError:  # PyYAML built without libyaml
+    _YamlLoader = yaml.SafeLoader
+
 
 # Default config directory
 CONFIG_DIR = Path(__file__).parent.parent.parent / 'config'
+_CONFIG_DIR_STR = str(CONFIG_DIR.resolve())
 
 
 def load_config(config_name: str, config_dir: Optional[Path] = None) -> Dict[str, Any]:
     """
     Load a YAML configuration file.
     
+    Parsed configs are cached per (config_name, config_dir) and each caller
+    gets its own deep copy. Call clear_config_cache() to pick up edits made
+    on disk.
+    
     Args:
         config_name: Name of the config file (without .yaml extension)
         config_dir: Optional custom config directory
@@ -29,16 +41,27 @@ def load_config(config_name: str, config_dir: Optional[Path] = None) -> Dict[str
         FileNotFoundError: If config file doesn't exist
         yaml.YAMLError: If config file is invalid
     """
+    return copy.deepcopy(_load_config_cached(config_name, config_dir))
+
+
+def clear_config_cache():
+    """Forget parsed configs so the next load re-reads them from disk."""
+    _load_config_cached.cache_clear()
+
+
+@lru_cache(maxsize=16)
+def _load_config_cached(config_name: str, config_dir: Optional[Path] = None) -> Dict[str, Any]:
+    """Parse a config file once; the result is shared, so never mutate it."""
     if config_dir is None:
-        config_dir = CONFIG_DIR
-    
-    config_path = config_dir / f"{config_name}.yaml"
+        config_path = f"{_CONFIG_DIR_STR}/{config_name}.yaml"
+    else:
+        config_path = os.path.join(config_dir, f"{config_name}.yaml")
     
-    if not config_path.exists():
+    if not os.path.isfile(config_path):
         raise FileNotFoundError(f"Configuration file not found: {config_path}")
     
     with open(config_path, 'r', encoding='utf-8') as f:
-        config = yaml.safe_load(f)
+        config = yaml.load(f, Loader=_YamlLoader)
     
     return config or {}
 
@@ -75,10 +98,9 @@ def get_config_value(config: Dict[str, Any], key_path: str, default: Any = None)
         >>> get_config_value(config, 'agent.window_size')
         10
     """
-    keys = key_path.split('.')
     value = config
     
-    for key in keys:
+    for key in _split_key_path(key_path):
         if isinstance(value, dict) and key in value:
             value = value[key]
         else:
@@ -87,17 +109,23 @@ def get_config_value(config: Dict[str, Any], key_path: str, default: Any = None)
     return value
 
 
+@lru_cache(maxsize=256)
+def _split_key_path(key_path: str) -> Tuple[str, ...]:
+    """Split a dot-separated key path once per distinct path."""
+    return tuple(key_path.split('.'))
+
+
 # Quick access functions
 def get_agent_setting(key_path: str, default: Any = None) -> Any:
     """Get a setting from agent config."""
-    config = load_agent_config()
-    return get_config_value(config, key_path, default)
+    config = _load_config_cached('agent_config')
+    return copy.deepcopy(get_config_value(config, key_path, default))
 
 
 def get_safety_limit(key_path: str, default: Any = None) -> Any:
     """Get a limit from safety rules."""
-    config = load_safety_rules()
-    return get_config_value(config, key_path, default)
+    config = _load_config_cached('safety_rules')
+    return copy.deepcopy(get_config_value(config, key_path, default))
 
 
 if __name__ == '__main__':
@@ -0,0 +1,30 @@
+"""
+JIT Compilation Helpers
+Optional Numba acceleration for numeric kernels.
+
+Numba is not a hard dependency. When it is not installed, `njit` returns the
+decorated function unchanged, `prange` is the builtin `range` and
+`get_num_threads` reports a single thread, so kernels run as plain
+Python/NumPy with identical results.
+"""
+
+try:
+    from numba import get_num_threads, njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+    
+    def get_num_threads() -> int:
+        """Stand-in for numba.get_num_threads (no parallel workers)"""
+        return 1
+    
+    def njit(*args, **kwargs):
+        """Stand-in for numba.njit that leaves the function uncompiled"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        
+        def decorator(func):
+            return func
+        
+        return decorator
@@ -0,0 +1,9 @@
+"""
+Shared test setup: make the project root importable as in src/utils/benchmark.py.
+"""
+
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
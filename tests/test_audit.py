@@ -0,0 +1,103 @@
+"""
+Tests for AuditLogger: bounded history, per-type and per-action indexes, export.
+"""
+
+import json
+from datetime import datetime
+
+import pytest
+
+from src.safety import audit as audit_module
+from src.safety.audit import AuditLogger
+
+
+def _fill(logger: AuditLogger, count: int):
+    for i in range(count):
+        action_id = f'a-{i % 7}'
+        if i % 3 == 0:
+            logger.log_rollback(action_id, 'test', {}, {})
+        elif i % 3 == 1:
+            logger.log_outcome(action_id, {'success_rate_delta': 0.1}, {'success_rate_delta': 0.05}, True)
+        else:
+            logger.log_pattern('issuer_degradation', 0.5, ['HDFC_BANK'], [])
+
+
+def _assert_indexes_consistent(logger: AuditLogger):
+    entries = list(logger.entries)
+    for event_type, view in logger._by_type.items():
+        assert list(view) == [e for e in entries if e.event_type == event_type]
+    
+    expected_trails = {}
+    for e in entries:
+        if 'action_id' in e.details:
+            expected_trails.setdefault(e.details['action_id'], []).append(e)
+    assert {k: list(v) for k, v in logger._trail_index.items()} == expected_trails
+
+
+def test_indexes_follow_eviction():
+    logger = AuditLogger()
+    _fill(logger, logger.max_entries * 2 + 17)
+    
+    assert len(logger.entries) == logger.max_entries
+    _assert_indexes_consistent(logger)
+
+
+def test_trail_removed_once_all_entries_evicted():
+    logger = AuditLogger()
+    logger.max_entries = 3
+    logger.entries = type(logger.entries)(maxlen=3)
+    logger.log_rollback('old', 'test', {}, {})
+    for _ in range(3):
+        logger.log_pattern('retry_storm', 0.3, [], [])
+    
+    assert logger.get_decision_trail('old') == []
+    assert 'old' not in logger._trail_index
+    _assert_indexes_consistent(logger)
+
+
+def test_recent_entries_and_trail():
+    logger = AuditLogger()
+    _fill(logger, 30)
+    
+    recent = logger.get_recent_entries('outcome', limit=3)
+    assert len(recent) == 3
+    assert all(e['event_type'] == 'outcome' for e in recent)
+    assert recent[-1]['details'] is logger._by_type['outcome'][-1].details
+    
+    trail = logger.get_decision_trail('a-0')
+    assert [e['details']['action_id'] for e in trail] == ['a-0'] * len(trail)
+    assert len(trail) == len(logger._trail_index['a-0'])
+
+
+def test_export_to_json_is_atomic(tmp_path):
+    logger = AuditLogger()
+    _fill(logger, 10)
+    path = tmp_path / 'audit.json'
+    path.write_text('stale')
+    
+    logger.export_to_json(path)
+    
+    assert [p.name for p in tmp_path.iterdir()] == ['audit.json']
+    records = json.loads(path.read_text())
+    assert len(records) == 10
+    # Local naive timestamps, as datetime.now().isoformat() produces
+    timestamp = datetime.fromisoformat(records[0]['timestamp'])
+    assert timestamp.tzinfo is None
+    assert abs((datetime.now() - timestamp).total_seconds()) < 60
+
+
+def test_failed_export_removes_temp_file(tmp_path, monkeypatch):
+    logger = AuditLogger()
+    _fill(logger, 5)
+    path = tmp_path / 'audit.json'
+    path.write_text('previous')
+    
+    def fail(*args, **kwargs):
+        raise OSError('disk full')
+    
+    monkeypatch.setattr(audit_module.os, 'replace', fail)
+    with pytest.raises(OSError):
+        logger.export_to_json(path)
+    
+    assert [p.name for p in tmp_path.iterdir()] == ['audit.json']
+    assert path.read_text() == 'previous'
@@ -0,0 +1,200 @@
+"""
+Tests for PaymentObserver: counts matrix, latency histograms and window eviction.
+"""
+
+import random
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from src.agent import observer as observer_module
+from src.agent.observer import DIMENSIONS, PaymentObserver
+from src.models.state import PaymentMethod, PaymentStatus, PaymentTransaction
+from src.simulation.payment_simulator import PaymentSimulator
+
+
+def _transaction(
+    issuer: str = 'HDFC_BANK',
+    status: PaymentStatus = PaymentStatus.SUCCESS,
+    latency_ms: float = 200.0,
+    timestamp: datetime = None,
+    is_retry: bool = False,
+    **kwargs
+) -> PaymentTransaction:
+    return PaymentTransaction(
+        transaction_id=kwargs.pop('transaction_id', f"t-{random.random()}"),
+        timestamp=timestamp or datetime.now(),
+        amount=100.0,
+        currency='INR',
+        payment_method=kwargs.pop('payment_method', PaymentMethod.UPI),
+        issuer=issuer,
+        merchant_id=kwargs.pop('merchant_id', 'MERCHANT_1'),
+        status=status,
+        error_code=None if status is PaymentStatus.SUCCESS else 'DECLINED',
+        latency_ms=latency_ms,
+        is_retry=is_retry,
+        region=kwargs.pop('region', 'NORTH'),
+        **kwargs
+    )
+
+
+@pytest.fixture(scope='module')
+def stream():
+    random.seed(42)
+    simulator = PaymentSimulator(seed=42)
+    simulator.inject_issuer_degradation('HDFC_BANK', 0.6)
+    simulator.inject_retry_storm()
+    return simulator.generate_stream(3000, start_time=datetime.now())
+
+
+def _expected_counts(transactions):
+    """Recompute per-dimension counts from a list of transactions"""
+    expected = {dimension: {} for dimension in DIMENSIONS}
+    for t in transactions:
+        keys = ('current', t.issuer, t.payment_method.value, t.region, t.merchant_id)
+        for dimension, key in zip(DIMENSIONS, keys):
+            entry = expected[dimension].setdefault(key, {'success': 0, 'failed': 0, 'total': 0})
+            entry['success' if t.status is PaymentStatus.SUCCESS else 'failed'] += 1
+            entry['total'] += 1
+    return expected
+
+
+def test_batch_and_per_row_ingest_agree(stream):
+    per_row = PaymentObserver()
+    for transaction in stream:
+        per_row.ingest_transaction(transaction)
+    
+    batched = PaymentObserver()
+    for start in range(0, len(stream), 700):
+        batched.ingest_batch(stream[start:start + 700])
+    
+    assert per_row.stats == batched.stats
+    assert per_row.get_issuer_health() == batched.get_issuer_health()
+    assert per_row.get_method_performance() == batched.get_method_performance()
+    assert per_row.get_latency_stats('overall') == batched.get_latency_stats('overall')
+    assert per_row.retry_count_window == batched.retry_count_window
+    assert list(per_row.transactions_window) == list(batched.transactions_window)
+
+
+def test_counts_match_transactions(stream):
+    observer = PaymentObserver()
+    observer.ingest_batch(stream)
+    
+    stats = {dimension: {k: v for k, v in keys.items() if v['total']} for dimension, keys in observer.stats.items()}
+    assert stats == _expected_counts(stream)
+    assert observer.retry_count_window == sum(t.is_retry for t in stream)
+    assert observer.get_transaction_volume() == len(stream)
+
+
+def test_reads_flush_staged_rows():
+    observer = PaymentObserver()
+    observer.ingest_transaction(_transaction(status=PaymentStatus.FAILED))
+    observer.ingest_transaction(_transaction())
+    
+    assert len(observer._staged) == 2
+    assert observer.get_success_rate('by_issuer', 'HDFC_BANK') == 0.5
+    assert not observer._staged
+
+
+def test_latency_histograms_track_per_key_latency():
+    observer = PaymentObserver()
+    latencies = np.linspace(50, 950, 200)
+    for latency in latencies:
+        observer.ingest_transaction(_transaction(issuer='SBI', latency_ms=float(latency)))
+    observer.ingest_transaction(_transaction(issuer='SBI', latency_ms=0.0))  # not tracked
+    
+    stats = observer.get_latency_stats('by_issuer', 'SBI')
+    assert stats['mean'] == pytest.approx(latencies.mean())
+    # Buckets are 64 per power of two, so quantiles are within ~1.1%
+    for name, q in (('p50', 50), ('p95', 95), ('p99', 99)):
+        assert stats[name] == pytest.approx(np.percentile(latencies, q), rel=0.02)
+    assert stats['max'] == pytest.approx(latencies.max(), rel=0.02)
+    
+    overall = observer.get_latency_stats('overall')
+    assert overall['p50'] == pytest.approx(np.percentile(latencies, 50))
+    assert overall['max'] == latencies.max()
+    
+    assert observer.get_latency_stats('by_issuer', 'UNKNOWN')['p50'] == 0
+
+
+def test_overall_latency_keeps_most_recent_samples(monkeypatch):
+    monkeypatch.setattr(observer_module, 'OVERALL_LATENCY_SAMPLES', 1000)
+    observer = PaymentObserver()
+    observer.ingest_batch([_transaction(latency_ms=5000.0) for _ in range(600)])
+    observer.ingest_batch([_transaction(latency_ms=100.0) for _ in range(1000)])
+    
+    assert observer.get_latency_stats('overall')['max'] == 100.0
+
+
+def test_window_evicts_old_transactions():
+    observer = PaymentObserver(window_size_minutes=10)
+    now = datetime.now()
+    old = [
+        _transaction(issuer='OLD_BANK', status=PaymentStatus.FAILED, timestamp=now - timedelta(minutes=30), is_retry=True)
+        for _ in range(50)
+    ]
+    recent = [_transaction(issuer='NEW_BANK', timestamp=now - timedelta(seconds=i)) for i in range(80)]
+    observer.ingest_batch(old + recent)
+    
+    assert list(observer.transactions_window) == recent
+    assert observer.get_transaction_volume('by_issuer', 'OLD_BANK') == 0
+    assert observer.get_transaction_volume('by_issuer', 'NEW_BANK') == 80
+    assert observer.get_success_rate() == 1.0
+    assert observer.retry_count_window == 0
+    assert observer.latency_hists[observer_module.DIM_ISSUER].sum() == 80
+    assert observer.get_latency_stats('by_issuer', 'OLD_BANK')['mean'] == 0
+
+
+def test_window_eviction_stops_at_first_recent_row():
+    observer = PaymentObserver(window_size_minutes=10)
+    now = datetime.now()
+    rows = [
+        _transaction(timestamp=now - timedelta(minutes=20)),
+        _transaction(timestamp=now),
+        _transaction(timestamp=now - timedelta(minutes=20)),  # expired, but behind a recent row
+    ]
+    observer.ingest_batch(rows)
+    
+    assert list(observer.transactions_window) == rows[1:]
+
+
+def test_window_grows_past_initial_capacity(stream):
+    capacity = observer_module.INITIAL_WINDOW_CAPACITY
+    observer = PaymentObserver()
+    observer.ingest_batch(stream[:capacity * 2 + 5])
+    
+    assert len(observer.transactions_window) == capacity * 2 + 5
+    assert observer.get_transaction_volume() == capacity * 2 + 5
+
+
+def test_many_keys_grow_counts_and_histograms():
+    observer = PaymentObserver()
+    observer.ingest_batch([
+        _transaction(issuer=f'BANK_{i}', merchant_id=f'M_{i}', latency_ms=100.0 + i) for i in range(300)
+    ])
+    
+    assert observer.get_transaction_volume('by_merchant', 'M_299') == 1
+    assert observer.get_latency_stats('by_issuer', 'BANK_299')['mean'] == pytest.approx(399.0)
+
+
+def test_scan_low_success_matches_python():
+    scan = observer_module._scan_low_success
+    py_scan = getattr(scan, 'py_func', scan)
+    success = np.array([5, 9, 40, 0, 2])
+    totals = np.array([20, 10, 50, 5, 2])
+    
+    for flagged, rates in (scan(success, totals, 10, 0.8), py_scan(success, totals, 10, 0.8)):
+        assert flagged.tolist() == [0]
+        assert rates.tolist() == [0.25]
+
+
+def test_summary_keeps_iso_timestamp():
+    observer = PaymentObserver()
+    observer.ingest_transaction(_transaction())
+    summary = observer.get_summary()
+    
+    stamped = datetime.fromisoformat(summary['timestamp'])
+    assert stamped.tzinfo is None
+    assert stamped == datetime.fromtimestamp(summary['timestamp_ns'] / 1e9)
+    assert summary['total_transactions'] == 1
@@ -0,0 +1,149 @@
+"""
+Tests for PaymentSimulator: alias sampling, seeding and the vectorized paths.
+"""
+
+import random
+from collections import Counter
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from src.models.state import PaymentMethod, PaymentStatus
+from src.simulation import payment_simulator as simulator_module
+from src.simulation.payment_simulator import PaymentSimulator, _AliasSampler
+
+START = datetime(2024, 1, 1, 12, 0, 0)
+
+
+def _fields(transaction):
+    data = transaction.to_dict()
+    data.pop('transaction_id')
+    data.pop('original_transaction_id')
+    return data
+
+
+def _degraded_simulator(seed=None):
+    simulator = PaymentSimulator(seed=seed)
+    simulator.inject_issuer_degradation('HDFC_BANK', 0.6)
+    simulator.inject_method_fatigue(PaymentMethod.CREDIT_CARD, 0.5)
+    simulator.inject_latency_spike(3.0)
+    return simulator
+
+
+@pytest.mark.parametrize('weights', [[0.5, 0.5], [0.45, 0.25, 0.15, 0.10, 0.05], [1, 0, 3]])
+def test_alias_sampler_matches_weights(weights):
+    sampler = _AliasSampler(weights)
+    expected = np.array(weights) / sum(weights)
+    n = 200_000
+    
+    random.seed(0)
+    scalar = Counter(sampler.sample() for _ in range(n))
+    array = np.bincount(sampler.sample_array(np.random.default_rng(0), n), minlength=len(weights))
+    
+    for counts in ([scalar[i] for i in range(len(weights))], array):
+        assert np.allclose(np.array(counts) / n, expected, atol=0.005)
+    if 0 in weights:  # zero weights are never drawn
+        assert scalar[weights.index(0)] == 0
+        assert array[weights.index(0)] == 0
+
+
+def test_seeded_stream_is_reproducible():
+    def run():
+        random.seed(7)
+        return [_fields(t) for t in _degraded_simulator().generate_stream(500, start_time=START)]
+    
+    assert run() == run()
+
+
+def test_seeded_vectorized_stream_is_reproducible():
+    def run():
+        return [_fields(t) for t in _degraded_simulator(seed=7).generate_stream_vectorized(500, start_time=START)]
+    
+    assert run() == run()
+
+
+def test_seeded_parallel_stream_is_reproducible():
+    def run():
+        return [_fields(t) for t in _degraded_simulator().generate_stream_parallel(400, start_time=START, seed=3)]
+    
+    first = run()
+    assert len(first) == 400
+    assert first == run()
+
+
+def test_parallel_stream_leaves_global_random_alone():
+    random.seed(1)
+    state = random.getstate()
+    _degraded_simulator().generate_stream_parallel(200, processes=1, start_time=START, seed=3)
+    
+    assert random.getstate() == state
+
+
+def test_vectorized_stream_same_with_and_without_numba(monkeypatch):
+    score_batch = simulator_module.score_batch
+    if not hasattr(score_batch, 'py_func'):
+        pytest.skip('numba not installed')
+    
+    compiled = _degraded_simulator(seed=11).generate_stream_vectorized(2000, start_time=START)
+    # Without Numba the jit shim leaves score_batch as the plain Python function
+    monkeypatch.setattr(simulator_module, 'score_batch', score_batch.py_func)
+    interpreted = _degraded_simulator(seed=11).generate_stream_vectorized(2000, start_time=START)
+    
+    assert [_fields(t) for t in compiled] == [_fields(t) for t in interpreted]
+
+
+def _summary(transactions):
+    by_issuer = {}
+    for t in transactions:
+        ok, total = by_issuer.get(t.issuer, (0, 0))
+        by_issuer[t.issuer] = (ok + (t.status is PaymentStatus.SUCCESS), total + 1)
+    rates = {issuer: ok / total for issuer, (ok, total) in by_issuer.items()}
+    failed = [t for t in transactions if t.status is not PaymentStatus.SUCCESS]
+    return {
+        'rates': rates,
+        'issuer_down': sum(t.error_code == 'ISSUER_DOWN' for t in failed) / len(failed),
+        'latency': np.mean([t.latency_ms for t in transactions]),
+    }
+
+
+def test_vectorized_matches_loop_distribution():
+    n = 40_000
+    random.seed(5)
+    loop = _summary(_degraded_simulator().generate_stream(n, start_time=START))
+    vectorized = _summary(_degraded_simulator(seed=5).generate_stream_vectorized(n, start_time=START))
+    
+    for issuer, rate in loop['rates'].items():
+        assert rate == pytest.approx(vectorized['rates'][issuer], abs=0.03)
+    assert loop['latency'] == pytest.approx(vectorized['latency'], rel=0.05)
+
+
+def test_scenarios_expire_without_exposing_deadlines(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(simulator_module.time, 'monotonic', lambda: clock[0])
+    simulator = PaymentSimulator(seed=0)
+    simulator.inject_issuer_degradation('HDFC_BANK', 0.6, duration_seconds=60)
+    simulator.inject_retry_storm(duration_seconds=300)
+    
+    active = simulator.get_active_scenarios()
+    assert [s['type'] for s in active] == ['issuer_degradation', 'retry_storm']
+    assert set(active[0]) == {'id', 'type', 'issuer', 'severity', 'injected_at', 'expires_at'}
+    
+    clock[0] += 120
+    simulator.generate_transaction()
+    assert [s['type'] for s in simulator.get_active_scenarios()] == ['retry_storm']
+    assert simulator._issuer_factor == [1.0] * len(simulator.issuers)
+
+
+def test_direct_scenario_edits_apply_after_reindex():
+    simulator = PaymentSimulator(seed=0)
+    simulator.inject_issuer_degradation('SBI', 0.5)
+    simulator.failure_scenarios.clear()
+    simulator.failure_scenarios['manual'] = {'type': 'retry_storm'}
+    simulator._reindex_scenarios()
+    
+    assert simulator._retry_factor == 0.5
+    assert simulator._issuer_factor == [1.0] * len(simulator.issuers)
+    assert not simulator._scenario_deadlines
+    simulator.cleanup_expired_scenarios()  # no deadline, so it stays
+    assert list(simulator.failure_scenarios) == ['manual']
@@ -0,0 +1,160 @@
+"""
+Tests for the state models: HourlyCounter, TransactionColumns and AgentState.
+"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from src.agent.observer import PaymentObserver
+from src.models import state as state_module
+from src.models.state import (
+    Action,
+    ActionType,
+    AgentState,
+    AuthorizationLevel,
+    HourlyCounter,
+    PaymentStatus,
+    RiskLevel,
+    TransactionColumns,
+)
+from src.simulation.payment_simulator import PaymentSimulator
+
+SECOND = 1_000_000_000
+
+
+class _Clock:
+    def __init__(self, seconds: int = 10_000):
+        self.ns = seconds * SECOND
+    
+    def advance(self, seconds: float):
+        self.ns += int(seconds * SECOND)
+    
+    def __call__(self) -> int:
+        return self.ns
+
+
+def _install_clock(monkeypatch) -> _Clock:
+    clock = _Clock()
+    monkeypatch.setattr(state_module.time, 'monotonic_ns', clock)
+    return clock
+
+
+def _action(action_id: str = '') -> Action:
+    return Action(
+        action_id, ActionType.ADJUST_RETRY, 'HDFC_BANK', {}, RiskLevel.LOW,
+        AuthorizationLevel.AUTOMATIC, {}, 'test', 0.9, datetime.now()
+    )
+
+
+def test_hourly_counter_totals_last_hour(monkeypatch):
+    clock = _install_clock(monkeypatch)
+    counter = HourlyCounter()
+    
+    counter.record()
+    counter.record(2)
+    clock.advance(1800)
+    counter.record(4)
+    assert counter.total() == 7
+    
+    clock.advance(1801)  # first three events are now over an hour old
+    assert counter.total() == 4
+    
+    clock.advance(1800)
+    assert counter.total() == 0
+
+
+def test_hourly_counter_clears_after_long_gap(monkeypatch):
+    clock = _install_clock(monkeypatch)
+    counter = HourlyCounter()
+    for _ in range(10):
+        counter.record()
+        clock.advance(100)
+    
+    clock.advance(10 * 3600)
+    assert counter.total() == 0
+    counter.record()
+    assert counter.total() == 1
+
+
+def test_agent_state_hourly_limits_decay(monkeypatch):
+    clock = _install_clock(monkeypatch)
+    state = AgentState()
+    state.record_action()
+    state.record_rollback()
+    assert (state.actions_taken_last_hour, state.rollbacks_last_hour) == (1, 1)
+    
+    clock.advance(3601)
+    assert (state.actions_taken_last_hour, state.rollbacks_last_hour) == (0, 0)
+
+
+def test_transaction_columns_wrap_around():
+    columns = TransactionColumns(capacity=5)
+    
+    def batch(start, stop):
+        values = np.arange(start, stop)
+        return dict(
+            status=values.astype(np.int8), method=values.astype(np.int8),
+            latency_ms=values.astype(float), amount=values * 2.0,
+            timestamp_ns=values.astype(np.int64), issuer_id=values.astype(np.int32)
+        )
+    
+    columns.extend(**batch(0, 3))
+    assert len(columns) == 3
+    columns.extend(**batch(3, 7))
+    assert len(columns) == 5
+    assert columns.count == 7
+    # Slot i holds the latest row whose index is i modulo capacity
+    assert columns.latency_ms.tolist() == [5.0, 6.0, 2.0, 3.0, 4.0]
+    
+    columns.extend(**batch(7, 20))  # more rows than capacity at once
+    assert columns.count == 20
+    assert sorted(columns.issuer_id.tolist()) == [15, 16, 17, 18, 19]
+    assert columns.amount[19 % 5] == 38.0
+
+
+def test_executing_count_tracks_action_ids():
+    state = AgentState()
+    first, second = _action('a-1'), _action('a-2')
+    
+    state.mark_executing(first)
+    state.mark_executing(second)
+    state.mark_executing(first)  # already executing
+    assert state.executing_count == 2
+    
+    state.mark_complete(first)
+    state.mark_complete(first)  # completing twice is harmless
+    assert state.executing_count == 1
+    state.mark_complete(second)
+    assert state.executing_count == 0
+
+
+def test_update_metrics_counts_the_observer_window():
+    now = datetime.now()
+    transactions = PaymentSimulator(seed=3).generate_stream_vectorized(400, start_time=now - timedelta(minutes=15))
+    observer = PaymentObserver(window_size_minutes=10)
+    observer.ingest_batch(transactions)
+    
+    state = AgentState()
+    state.update_metrics(observer.recent_columns, observer.window_cutoff_ns)
+    
+    window = list(observer.transactions_window)
+    assert 0 < len(window) < len(transactions)
+    assert state.total_transactions == len(window)
+    assert state.successful_transactions == sum(t.status is PaymentStatus.SUCCESS for t in window)
+    assert state.failed_transactions == sum(t.status is PaymentStatus.FAILED for t in window)
+    assert state.average_latency_ms == pytest.approx(np.mean([t.latency_ms for t in window]))
+    assert state.overall_success_rate == state.successful_transactions / len(window)
+
+
+def test_update_metrics_kernel_matches_python():
+    compute = state_module._compute_metrics
+    py_compute = getattr(compute, 'py_func', compute)
+    status = np.array([0, 1, 0, 2, 0], dtype=np.int8)
+    latency = np.array([100.0, 0.0, 300.0, 50.0, 80.0])
+    timestamp_ns = np.array([5, 10, 10, 20, 30], dtype=np.int64)
+    
+    assert compute(status, latency, timestamp_ns, 10) == py_compute(status, latency, timestamp_ns, 10)
+    assert compute(status, latency, timestamp_ns, 10)[:3] == (4, 2, 1)
+    assert compute(status, latency, timestamp_ns, 10)[3] == pytest.approx(430.0 / 3)